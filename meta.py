@@ -1,22 +1,254 @@
 # File: new_s.py (Merged Instagram, Facebook, and Threads Uploader)
 import os
 import time
+import json
+import hashlib
 import logging
 import requests
-import dropbox
-from telegram import Bot
-from datetime import datetime
-from pytz import timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
 import random
+import threading
 import re
-from groq import Groq
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote, urlencode
+
+_HASHTAG_RE = re.compile(r"#(\w+)")
+_FENCE_RE = re.compile(r"```(?:markdown|text)?")
+_TRAILING_HASHTAGS_RE = re.compile(r"(?:\s*#\w+)+\s*$")
+_FILENAME_SPACES = str.maketrans("_-", "  ")  # Word separators in upload filenames
+
+
+def _ext(name):
+    """Lowercased file extension, including the dot."""
+    return os.path.splitext(name)[1].lower()
+
+
+def _clean_caption(text):
+    """Remove markdown fences (```, ```markdown, ```text) and one matching pair of wrapping quotes."""
+    text = _FENCE_RE.sub('', text).strip()
+    if len(text) > 1 and text[0] == text[-1] and text[0] in '"\'':
+        text = text[1:-1]
+    return text
+
+
+def _truncate_caption(text, limit):
+    """Cut text to at most `limit` chars at a word boundary, keeping a trailing hashtag block when it fits."""
+    if len(text) <= limit:
+        return text
+    tags = _TRAILING_HASHTAGS_RE.search(text)
+    if tags and len(tags.group().strip()) < limit // 2:
+        tail = " " + tags.group().strip()
+        return _truncate_caption(text[:tags.start()], limit - len(tail)) + tail
+    cut = text[:limit + 1]
+    space = cut.rfind(' ')
+    return (cut[:space] if space > 0 else text[:limit]).rstrip()
+
+
+def _telegram_len(text):
+    """Length as Telegram counts it: UTF-16 code units, so emoji outside the BMP count twice."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _telegram_pieces(msg, limit):
+    """Split one message into pieces of at most `limit` Telegram characters, never inside a character."""
+    if _telegram_len(msg) <= limit:
+        return [msg]
+    pieces, start, size = [], 0, 0
+    for i, ch in enumerate(msg):
+        width = 2 if ord(ch) > 0xFFFF else 1
+        if size + width > limit:
+            pieces.append(msg[start:i])
+            start, size = i, 0
+        size += width
+    pieces.append(msg[start:])
+    return pieces
+
+
+def _telegram_chunks(messages, limit):
+    """Pack messages into newline-joined chunks of at most `limit` Telegram characters, splitting only oversized messages."""
+    buf, size = [], 0
+    for msg in messages:
+        for piece in _telegram_pieces(msg, limit):
+            length = _telegram_len(piece)
+            if buf and size + length > limit:
+                yield "\n".join(buf)
+                buf, size = [], 0
+            buf.append(piece)
+            size += length + 1
+    if buf:
+        yield "\n".join(buf)
+
+def _ttl_cached(cache_attr, ttl_attr):
+    """
+    Cache a method's truthy result on the instance as a (timestamp, value) tuple.
+
+    The entry lives in getattr(self, cache_attr) for getattr(self, ttl_attr) seconds; setting the
+    attribute to None invalidates it. Arguments are not part of the key. Calls are serialized, so
+    concurrent callers wait for one fetch instead of each hitting the API.
+    """
+    def decorator(fn):
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(self, *args):
+            with lock:
+                cached = getattr(self, cache_attr)
+                if cached and time.monotonic() - cached[0] < getattr(self, ttl_attr):
+                    return cached[1]
+                value = fn(self, *args)
+                # The method may have stored an entry itself (e.g. with an older timestamp)
+                if value and getattr(self, cache_attr) is cached:
+                    setattr(self, cache_attr, (time.monotonic(), value))
+                return value
+        return wrapper
+    return decorator
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to requests that don't pass one."""
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+# Static system prompts for Groq captions. The filename is sent last, in its own user message,
+# so these bytes are identical on every run and the provider's prefix cache can reuse them.
+_INSTAGRAM_SYSTEM_PROMPT = """Act as a poetic Instagram storyteller (2M+ followers) crafting aesthetic captions. Write a Facebook-style Instagram caption (≤1,800 chars, 350-360 words) for the filename given by the user, using ONLY poetic, aesthetic language derived purely from this filename's essence.
+
+Requirements:
+- Write in third person, referring to the creator as “they” or “this person”, never using “I”, “me”, “my”, or “we”
+- Use MULTIPLE short paragraphs with blank lines between them (do NOT make one big block)
+- Strong hook; evocative story tied EXCLUSIVELY to the filename; insightful close
+- Tell a descriptive, emotional story fully related to the filename
+- Add value/insight and relatable details
+- Sprinkle emojis naturally in each paragraph (not all at the end)
+- CTA question drawing from filename themes
+- Everything must stay under 1,800 characters including spaces/emojis/hashtags
+- Aesthetic, lyrical tone: metaphors, sensory details, rhythmic flow from the filename
+- NO clichés/generic phrases—create ORIGINAL poetic imagery from the filename's words/themes ONLY
+
+CRITICAL HASHTAG REQUIREMENT:
+- You MUST generate exactly 5-10 hashtags at the very end
+- ALL hashtags MUST be directly related to the filename and the story content
+- Analyze the filename and create hashtags based on:
+  * The main topic/subject of the filename
+  * Key words or themes from the filename
+  * Related trending topics that match the filename context
+- NO generic hashtags like #love #instagood #photooftheday
+- Lyrical, sensory storytelling with filename-derived metaphors/rhythm
+- ONLY topic-specific hashtags that relate to the filename
+- The hashtags should help people discover content about the same topic as the filename
+
+Flow to follow (do NOT label the sections, just write the caption):
+- Hooky first line that makes people keep reading
+- 3–5 short paragraphs, each with 2–4 sentences, separated by blank lines
+- Descriptive story with context (what happened, who, where) plus emotional, relatable details - all based on the filename
+- Engagement element with a question that invites replies
+- Call-to-action question at the end
+- Hashtags last (5-10, topic-specific) (NO generics)
+
+Generate only the caption text (no section labels, no extra notes). Keep it under 1,800 characters total, clearly paragraph-separated, and fully tied to the filename's topic. Remember: Hashtags MUST be generated based on the filename."""
+
+_FACEBOOK_SYSTEM_PROMPT = """Act as a lyrical Facebook poet (2M+ followers) weaving aesthetic narratives. Create a detailed Facebook caption for the filename given by the user (≤2,000 chars, ~450 words) using poetic language drawn PURELY from the filename's essence.
+
+CRITICAL REQUIREMENTS:
+- Use only third‑person references (they / them / this person), and never use first‑person words like “I”, “me”, “my”, or “we”
+- Maximum 3,000 characters total (including hashtags)
+- Aim ~480 words (but stay under 2,000 chars)
+- End with exactly 5-10 targeted, topic-specific hashtags (no generic tags)
+- Lyrical, sensory storytelling with filename-derived metaphors/rhythm
+- NO clichés—ORIGINAL poetic expressions from the filename's themes/words ONLY
+- Include questions to encourage engagement
+- Add emojis strategically throughout paragraphs
+- Make it informative, shareable, and valuable
+- Hook; emotional filename journey; wisdom; 2 engagement questions
+- Do not exceed the character limit
+
+STRUCTURE (no labels, just text):
+- Hooky first line
+- 3–5 short paragraphs, 2–4 sentences each, separated by blank lines, 4-6 lyrical paragraphs
+- Emotional storytelling + relatable details
+- Engagement questions + call to action at the end
+- Hashtags last (5-10, topic-specific) (NO generics)
+
+Generate only the caption text."""
+
+_THREADS_SYSTEM_PROMPT = """Act as poetic Threads whisperer. Craft an aesthetic Threads post for the filename given by the user (≤390 chars) using poetic essence from the filename ONLY.
+
+CRITICAL REQUIREMENTS:
+- Always write in third person (“they / them / this person”), never in first person (“I / me / my / we”)
+- ABSOLUTE MAXIMUM: 390 characters total (including hashtags and spaces)
+- Start with a strong hook to grab attention immediately
+- Keep it conversational, engaging, and shareable
+- Lyrical, condensed poetry (under 390 chars total)
+- Make it punchy and viral-worthy
+- Add 1-2 emojis if they fit naturally
+
+CRITICAL HASHTAG REQUIREMENT:
+- You MUST generate exactly 2-3 hashtags at the very end
+- ALL hashtags MUST be directly related to the filename and the post content
+- Analyze the filename and create hashtags based on:
+  * The main topic/subject of the filename
+  * Key words or themes from the filename
+  * Related trending topics that match the filename context
+- NO generic hashtags
+- Hook + poetic essence + 2-3 filename hashtags
+- ONLY topic-specific hashtags that relate to the filename
+- The hashtags should help people discover content about the same topic as the filename
+
+STRUCTURE:
+- Hook (first line grabs attention)
+- Main message (concise and impactful, related to the filename)
+- 2-3 hashtags at the end (MUST be related to the filename)
+
+IMPORTANT: Count characters carefully. The total must be UNDER 390 characters including all spaces, punctuation, and hashtags.
+
+Generate only the caption text, nothing else. Keep it short and powerful. Remember: Hashtags MUST be generated based on the filename."""
+
+_COMBINED_SYSTEM_PROMPT = (
+    "Write three captions for the filename given by the user, one per platform, each following its brief below. "
+    'Reply with ONLY a JSON object of the form {"instagram": "...", "facebook": "...", "threads": "..."}.\n\n'
+    "=== instagram ===\n" + _INSTAGRAM_SYSTEM_PROMPT + "\n\n"
+    "=== facebook ===\n" + _FACEBOOK_SYSTEM_PROMPT + "\n\n"
+    "=== threads ===\n" + _THREADS_SYSTEM_PROMPT
+)
+
 
 class UnifiedSocialMediaUploader:
     DROPBOX_TOKEN_URL = "https://api.dropbox.com/oauth2/token"
     INSTAGRAM_API_BASE = "https://graph.facebook.com/v18.0"
     THREADS_API_BASE = "https://graph.threads.net/v1.0"
+    PLATFORMS = (("instagram", "Instagram"), ("facebook", "Facebook"), ("threads", "Threads"))
+    ERROR_CLASSES = {
+        **dict.fromkeys(range(500, 600), "transient"),  # Retry normally
+        400: "permanent", 403: "permanent", 404: "permanent",  # Don't retry
+        429: "rate_limit"  # Retry after longer delay
+    }
+    GRAPH_THROTTLE_CODES = frozenset({4, 17, 32, 613})  # Graph error codes for app/user/page/API rate limits
+    VIDEO_EXTS = frozenset({'.mp4', '.mov'})
+    IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'})
+    UPLOAD_EXTS = VIDEO_EXTS | {'.jpg', '.jpeg', '.png'}  # Files picked up from Dropbox
+    FB_REEL_MIN_SIZE = (540, 960)    # (width, height) Facebook accepts as a Reel
+    FB_REEL_MAX_SIZE = (1080, 1920)
+    FB_REEL_DURATION = (3, 90)       # (min, max) seconds
     INSTAGRAM_REEL_STATUS_RETRIES = 10
-    INSTAGRAM_REEL_STATUS_WAIT_TIME = 15
+    INSTAGRAM_REEL_STATUS_BASE_WAIT = 2   # First reel status poll interval (doubles with jitter)
+    INSTAGRAM_REEL_STATUS_WAIT_TIME = 20  # Max seconds between reel status polls
+    INSTAGRAM_NOT_READY_BASE_WAIT = 1  # First wait after a "Media ID is not available" publish (doubles with jitter)
+    INSTAGRAM_NOT_READY_MAX_WAIT = 8   # Max seconds between publishes of a not-ready container
+    THREADS_STATUS_RETRIES = 60
+    THREADS_STATUS_BASE_WAIT = 2    # First Threads status poll interval (doubles with jitter)
+    THREADS_STATUS_MAX_WAIT = 8     # Max seconds between Threads status polls
     
     # Verification configuration
     VERIFY_DELAY_INSTAGRAM = 8  # Wait before starting Instagram verification
@@ -24,27 +256,72 @@ class UnifiedSocialMediaUploader:
     VERIFY_DELAY_THREADS = 3    # Wait before starting Threads verification
     VERIFY_ATTEMPTS = 2         # Max verification attempts (reduced for faster failover)
     VERIFY_INTERVAL = 5         # Base interval between verification attempts
-    USE_EXPONENTIAL_BACKOFF = False  # Use fixed interval for faster verification
+    VERIFY_MAX_INTERVAL = 30    # Cap for the full-jitter verification backoff
+    # Per-platform verification: (node URL base, fields to read, initial delay).
+    # Only existence and the permalink for the success message are needed, so keep responses minimal
+    VERIFY_TARGETS = {
+        "Instagram": (INSTAGRAM_API_BASE, "id,permalink", VERIFY_DELAY_INSTAGRAM),  # IG media names it "permalink"
+        "Facebook": ("https://graph.facebook.com", "id,permalink_url", VERIFY_DELAY_FACEBOOK),
+        "Threads": (THREADS_API_BASE, "id", VERIFY_DELAY_THREADS)  # Existence check only; keep the response minimal
+    }
     
     # Publish retry configuration (fast failover to avoid hanging)
     INSTAGRAM_PUBLISH_ATTEMPTS = 3  # Max attempts to publish Instagram post
     FACEBOOK_PUBLISH_ATTEMPTS = 3   # Max attempts to publish Facebook post
     THREADS_PUBLISH_ATTEMPTS = 5    # Max attempts to publish Threads post
-    PUBLISH_RETRY_INTERVAL = 5      # Seconds between publish retries
+    PUBLISH_RETRY_INTERVAL = 5      # Base seconds between publish retries (doubles with jitter)
+    PUBLISH_RETRY_MAX_INTERVAL = 20 # Cap for backed-off publish retries
     PUBLISH_MAX_WAIT_TIME = 30       # Maximum seconds to spend on publishing (for all platforms)
 
+    # AI caption configuration, built once: the prompts are static, the filename is sent separately
+    GROQ_MODELS = (
+        "llama-3.1-8b-instant",     # Fast, recommended
+        "llama3-8b-8192",           # Alternative name
+        "llama-3.1-70b-versatile",  # More powerful fallback
+    )
+    # truncate_at sits a little below the caption limit each prompt asks for, as a safety margin
+    CAPTION_PLATFORMS = {
+        'instagram': {'truncate_at': 1700, 'max_tokens': 2000, 'system_prompt': _INSTAGRAM_SYSTEM_PROMPT},  # ~360 words
+        'facebook': {'truncate_at': 2950, 'max_tokens': 3500, 'system_prompt': _FACEBOOK_SYSTEM_PROMPT},    # ~480 words
+        'threads': {'truncate_at': 360, 'max_tokens': 180, 'system_prompt': _THREADS_SYSTEM_PROMPT},         # Threads rejects >500
+    }
+
+    # HTTP timeouts as (connect, read) seconds, so a stalled API can't outlast the publish budgets
+    HTTP_TIMEOUT = (5, 30)
+    HTTP_UPLOAD_TIMEOUT = (5, 120)  # Facebook fetches the whole video before answering the upload call
+
+    # Cache configuration
+    FILES_CACHE_TTL = 30            # Seconds to reuse a Dropbox folder listing
+    PAGE_TOKEN_CACHE_TTL = 45 * 60  # Seconds to reuse a Page Access Token (in memory only)
+    DISK_CACHE_PATH = "/tmp/meta_cache.json"  # Carried between runs by the workflow's actions/cache steps
+    DISK_CACHE_ENTRIES = ("preflight", "captions", "groq_model")  # Only entries persisted; never credentials
+    PREFLIGHT_CACHE_TTL = 6 * 3600            # Max seconds to trust a cached token/connection check
+    PREFLIGHT_MIN_TOKEN_LIFE = 24 * 3600      # Re-check with Graph once the token is this close to expiry
+    CAPTION_PROMPT_VERSION = 1                # Bump when the caption prompts change to invalidate cached captions
+    CAPTION_CACHE_MAX_ENTRIES = 50            # Oldest cached captions are dropped beyond this
+
+    # Telegram batching configuration
+    TELEGRAM_BATCH_INTERVAL = 10.0    # Seconds to coalesce regular messages before flushing
+    TELEGRAM_PRIORITY_INTERVAL = 0.1  # Flush delay once an immediate error is queued
+    TELEGRAM_BATCH_MAX_CHARS = 3500   # Flush right away once the buffer reaches this size
+    TELEGRAM_MAX_MESSAGE_LEN = 4000   # Telegram rejects messages over 4096 UTF-16 code units
+    TELEGRAM_SHUTDOWN_TIMEOUT = 10    # Max seconds to wait for the final flush on exit
+    TELEGRAM_SEND_TIMEOUT = (5, 5)    # (connect, read) seconds per sendMessage call, well inside the shutdown wait
+    BACKGROUND_TASK_TIMEOUT = 45      # Max seconds to wait for background work (verification, Dropbox delete) on exit
+
     def __init__(self):
         self.script_name = "new_s.py"
-        self.ist = timezone('Asia/Kolkata')
+        self._log_prefix = f"[{self.script_name}]\n"  # Prepended to every console/Telegram message
+        self.ist = ZoneInfo('Asia/Kolkata')
         self.account_key = "ink-wisps"
 
-        # Logging
+        # Logging (set LOG_LEVEL=WARNING to silence the INFO breadcrumbs)
         logging.basicConfig(
-            level=logging.INFO,
+            level=os.getenv("LOG_LEVEL", "INFO").upper(),
             format="%(asctime)s - %(levelname)s - %(message)s",
             handlers=[logging.StreamHandler()]
         )
-        self.logger = logging.getLogger()
+        self.logger = logging.getLogger(__name__)
 
         # Instagram/Facebook secrets from GitHub environment
         self.meta_token = os.getenv("META_TOKEN")
@@ -55,6 +332,15 @@ class UnifiedSocialMediaUploader:
         self.threads_user_id = os.getenv("THREADS_USER_ID")
         self.threads_access_token = os.getenv("THREADS_ACCESS_TOKEN")
         
+        # Account-specific endpoints (fixed for the life of the uploader)
+        self.ig_media_url = f"{self.INSTAGRAM_API_BASE}/{self.ig_id}/media"
+        self.ig_publish_url = f"{self.INSTAGRAM_API_BASE}/{self.ig_id}/media_publish"
+        self.fb_reels_url = f"https://graph.facebook.com/v23.0/{self.fb_page_id}/video_reels"
+        self.fb_videos_url = f"https://graph.facebook.com/{self.fb_page_id}/videos"
+        self.fb_photos_url = f"https://graph.facebook.com/{self.fb_page_id}/photos"
+        self.threads_post_url = f"{self.THREADS_API_BASE}/{self.threads_user_id}/threads"
+        self.threads_publish_url = f"{self.THREADS_API_BASE}/{self.threads_user_id}/threads_publish"
+        
         # Telegram configuration
         self.telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
         self.telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID")
@@ -65,50 +351,124 @@ class UnifiedSocialMediaUploader:
         self.dropbox_refresh = os.getenv("DROPBOX_REFRESH_TOKEN")
         self.dropbox_folder = "/ink-wisps"
 
+        # Telegram is called straight through the Bot API on the shared session
         if self.telegram_token:
-            self.telegram_bot = Bot(token=self.telegram_token)
+            self.telegram_send_url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
         else:
-            self.telegram_bot = None
+            self.telegram_send_url = None
 
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.session = requests.Session()
+        # Keep warm connections to Graph/Threads/Dropbox across the poll loops.
+        # Retry only covers idempotent methods, so publish POSTs are never replayed.
+        # 429s are left to the callers' own capped rate-limit handling.
+        adapter = _TimeoutHTTPAdapter(
+            timeout=self.HTTP_TIMEOUT,
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],
+                respect_retry_after_header=False,
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
         self.log_buffer = []  # Buffer for log messages
+        self._telegram_cond = threading.Condition()  # Guards log_buffer and wakes the sender thread
+        self._flush_deadline = None   # Monotonic time the pending batch is due
+        self._telegram_sending = False
+        self._files_cache = None       # (timestamp, entries) from list_dropbox_files
+        self._page_token_cache = None  # (timestamp, token) from get_page_access_token
+        self._ig_connection_ok = None  # Instagram link result from run_preflight_checks
+        self._background_threads = []  # Started by run_in_background, joined at the end of run()
+        self._groq_client = None       # Created on first use by get_groq_client
+        self._groq_model = None        # Last model that answered; tried first by groq_models
+
+        # Telegram sends happen on a daemon thread so logging never waits on the network
+        if self.telegram_send_url and self.telegram_chat_id:
+            threading.Thread(target=self._telegram_worker, name="telegram-sender", daemon=True).start()
 
     def send_message(self, msg, level=logging.INFO, immediate=False):
-        prefix = f"[{self.script_name}]\n"
-        full_msg = prefix + msg
-        self.log_buffer.append(full_msg)
-        try:
-            if immediate and self.telegram_bot and self.telegram_chat_id:
-                self.telegram_bot.send_message(chat_id=self.telegram_chat_id, text=full_msg)
-            # Also log the message to console with the specified level
-            if level == logging.ERROR:
-                self.logger.error(full_msg)
-            else:
-                self.logger.info(full_msg)
-        except Exception as e:
-            self.logger.error(f"Telegram send error for message '{full_msg}': {e}")
+        """
+        Log a message and queue it for Telegram.
 
-    def send_log_summary(self):
-        """Send buffered log messages as summary to Telegram."""
-        if self.telegram_bot and self.telegram_chat_id and self.log_buffer:
-            summary = '\n'.join(self.log_buffer)
-            max_len = 4000
-            for i in range(0, len(summary), max_len):
+        Messages are batched and sent by the background sender thread. immediate=True shortens
+        the flush delay only for errors; other messages coalesce into the regular batch.
+        """
+        full_msg = self._log_prefix + msg
+        with self._telegram_cond:
+            self.log_buffer.append(full_msg)
+            if self.telegram_send_url and self.telegram_chat_id:
+                urgent = immediate and level >= logging.ERROR
+                deadline = time.monotonic() + (self.TELEGRAM_PRIORITY_INTERVAL if urgent else self.TELEGRAM_BATCH_INTERVAL)
+                if self._flush_deadline is None or deadline < self._flush_deadline:
+                    self._flush_deadline = deadline
+                self._telegram_cond.notify()
+        # Also log the message to console with the specified level
+        self.logger.log(level, full_msg)
+
+    def _telegram_flush_due(self):
+        """Whether the buffered batch should be sent now. Caller holds _telegram_cond."""
+        if not self.log_buffer:
+            return False
+        if self._flush_deadline is not None and self._flush_deadline <= time.monotonic():
+            return True
+        return sum(len(m) + 1 for m in self.log_buffer) >= self.TELEGRAM_BATCH_MAX_CHARS
+
+    def _telegram_worker(self):
+        """Sender thread: wait for a batch to come due, then send it to Telegram."""
+        while True:
+            with self._telegram_cond:
+                while not self._telegram_flush_due():
+                    timeout = None if self._flush_deadline is None else self._flush_deadline - time.monotonic()
+                    self._telegram_cond.wait(timeout)
+                messages = self.log_buffer
+                self.log_buffer = []
+                self._flush_deadline = None
+                self._telegram_sending = True
+            for chunk in _telegram_chunks(messages, self.TELEGRAM_MAX_MESSAGE_LEN):
                 try:
-                    self.telegram_bot.send_message(chat_id=self.telegram_chat_id, text=summary[i:i+max_len])
-                except Exception as e:
-                    self.logger.error(f"Telegram send error: {e}")
-        self.log_buffer = []
-
-    def log_console_only(self, msg, level=logging.INFO):
-        """Log message to console only, not to Telegram."""
-        prefix = f"[{self.script_name}]\n"
-        full_msg = prefix + msg
-        if level == logging.ERROR:
-            self.logger.error(full_msg)
-        else:
-            self.logger.info(full_msg)
+                    res = self.session.post(self.telegram_send_url, data={"chat_id": self.telegram_chat_id, "text": chunk},
+                                           timeout=self.TELEGRAM_SEND_TIMEOUT)
+                    if res.status_code != 200:
+                        self.logger.error(f"Telegram send error: HTTP {res.status_code}: {res.text[:200]}")
+                except requests.RequestException as e:
+                    # The exception text can include the URL, and with it the bot token
+                    self.logger.error(f"Telegram send error: {type(e).__name__}")
+            with self._telegram_cond:
+                self._telegram_sending = False
+                self._telegram_cond.notify_all()
+
+    def flush_telegram(self, timeout=None):
+        """
+        Send all buffered messages now and wait for the sender thread to finish.
+
+        Returns:
+            bool: False if the buffer was not drained within timeout
+        """
+        with self._telegram_cond:
+            if not (self.telegram_send_url and self.telegram_chat_id):
+                self.log_buffer.clear()
+                return True
+            if self.log_buffer:
+                self._flush_deadline = time.monotonic()
+                self._telegram_cond.notify_all()
+            return self._telegram_cond.wait_for(lambda: not self.log_buffer and not self._telegram_sending, timeout)
+
+    def send_log_summary(self):
+        """Flush any log messages still buffered for Telegram, without hanging the exit."""
+        if not self.flush_telegram(timeout=self.TELEGRAM_SHUTDOWN_TIMEOUT):
+            self.logger.error("Telegram flush timed out; some messages were not sent")
+
+    def log_console_only(self, msg, *args, level=logging.INFO):
+        """Log message to console only, not to Telegram. Extra args are %-formatted lazily into msg."""
+        # Skip building the prefixed message when the level is filtered out
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(level, self._log_prefix + msg, *args)
 
     def refresh_dropbox_token(self):
         self.logger.info("Refreshing Dropbox token...")
@@ -120,377 +480,98 @@ class UnifiedSocialMediaUploader:
         }
         r = self.session.post(self.DROPBOX_TOKEN_URL, data=data)
         if r.status_code == 200:
-            new_token = r.json().get("access_token")
+            new_token = self.response_json(r).get("access_token")
             self.logger.info("Dropbox token refreshed.")
             return new_token
         else:
             self.send_message("❌ Dropbox refresh failed: " + r.text, level=logging.ERROR, immediate=True)
             raise Exception("Dropbox refresh failed.")
 
+    @_ttl_cached("_files_cache", "FILES_CACHE_TTL")
     def list_dropbox_files(self, dbx):
         try:
-            files = dbx.files_list_folder(self.dropbox_folder).entries
-            valid_exts = ('.mp4', '.mov', '.jpg', '.jpeg', '.png')
-            return [f for f in files if f.name.lower().endswith(valid_exts)]
+            return [f for f in self.iter_dropbox_entries(dbx) if _ext(f.name) in self.UPLOAD_EXTS]
         except Exception as e:
             self.send_message(f"❌ Dropbox folder read failed: {e}", level=logging.ERROR, immediate=True)
             return []
 
+    def iter_dropbox_entries(self, dbx):
+        """Yield every entry in the upload folder, following the listing cursor across pages."""
+        result = dbx.files_list_folder(self.dropbox_folder)
+        yield from result.entries
+        while result.has_more:
+            result = dbx.files_list_folder_continue(result.cursor)
+            yield from result.entries
+
     def build_caption_from_filename(self, file):
         """Use filename as caption (fallback method)."""
         base_name = os.path.splitext(file.name)[0]
         base_name = base_name.replace('_', ' ')
         return base_name
 
+    def get_groq_client(self, api_key):
+        """Return the shared Groq client, creating it on first use so its connection pool is reused."""
+        if self._groq_client is None:
+            from groq import Groq  # Deferred: heavy import only needed once captions are generated
+            self._groq_client = Groq(api_key=api_key)
+            self._groq_model = self.load_disk_cache().get("groq_model")
+            self.log_console_only("✅ Groq client initialized successfully", level=logging.INFO)
+        return self._groq_client
+
+    def groq_models(self):
+        """GROQ_MODELS in the order to try them, starting with the last model that answered."""
+        if self._groq_model not in self.GROQ_MODELS:
+            return self.GROQ_MODELS
+        return (self._groq_model,) + tuple(m for m in self.GROQ_MODELS if m != self._groq_model)
+
+    def remember_groq_model(self):
+        """Persist the model that last answered so the next run tries it first."""
+        if self._groq_model and self.load_disk_cache().get("groq_model") != self._groq_model:
+            self.save_disk_cache(groq_model=self._groq_model)
+
     def build_ai_caption_from_filename(self, file):
         """Generate platform-specific captions using Groq AI based on filename."""
-        filename = os.path.splitext(file.name)[0].replace('_', ' ').replace('-', ' ')
+        filename = os.path.splitext(file.name)[0].translate(_FILENAME_SPACES)
         
         # Check for API key with detailed logging
         groq_api_key = os.getenv('GROQ_API_KEY')
         if not groq_api_key:
             self.send_message("⚠️ GROQ_API_KEY not found in environment variables. Using fallback captions.", level=logging.WARNING, immediate=True)
             self.log_console_only("💡 To use AI captions, set GROQ_API_KEY environment variable", level=logging.INFO)
-            fallback_caption = self.build_caption_from_filename(file)
-            return {
-                'instagram': fallback_caption,
-                'facebook': fallback_caption,
-                'threads': fallback_caption
-            }
+            return dict.fromkeys(self.CAPTION_PLATFORMS, self.build_caption_from_filename(file))
         
         self.log_console_only(f"🔑 GROQ_API_KEY found (length: {len(groq_api_key)})", level=logging.INFO)
         
+        # A retried file reuses the captions generated on an earlier run
+        cache_key = hashlib.sha1(f"{filename}:{self.CAPTION_PROMPT_VERSION}".encode()).hexdigest()
+        cached = self.load_disk_cache().get("captions", {}).get(cache_key)
+        if cached:
+            self.send_message("♻️ Reusing cached AI captions for this file", level=logging.INFO, immediate=True)
+            return cached
+        
         try:
-            groq_client = Groq(api_key=groq_api_key)
-            self.log_console_only("✅ Groq client initialized successfully", level=logging.INFO)
+            groq_client = self.get_groq_client(groq_api_key)
         except Exception as e:
             self.send_message(f"❌ Failed to initialize Groq client: {type(e).__name__}: {e}", level=logging.ERROR, immediate=True)
             self.log_console_only(f"❌ Full error details: {str(e)}", level=logging.ERROR)
+            return dict.fromkeys(self.CAPTION_PLATFORMS, self.build_caption_from_filename(file))
+        
+        # One JSON request covers all three platforms; fall back to one request per platform
+        captions = self.generate_combined_captions(groq_client, filename)
+        if captions is None:
+            # The three Groq calls are independent, so run them concurrently
+            with ThreadPoolExecutor(max_workers=len(self.CAPTION_PLATFORMS)) as executor:
+                futures = {
+                    platform: executor.submit(self.generate_platform_caption, groq_client, filename, platform, config)
+                    for platform, config in self.CAPTION_PLATFORMS.items()
+                }
+            captions = {platform: future.result() for platform, future in futures.items()}
+        
+        # Failed platforms come back as None; fill them with the filename-based caption
+        ai_generated_count = sum(caption is not None for caption in captions.values())
+        if ai_generated_count < len(captions):
             fallback_caption = self.build_caption_from_filename(file)
-            return {
-                'instagram': fallback_caption,
-                'facebook': fallback_caption,
-                'threads': fallback_caption
-            }
-        
-        platforms = {
-            'instagram': {
-                'max_words': 360,
-                'max_chars': 1800,  # Instagram target cap: 1,800 characters
-                'hashtag_count': '5-10',
-                'prompt': f"""Act as a poetic Instagram storyteller (2M+ followers) crafting aesthetic captions. Write a Facebook-style Instagram caption (≤1,800 chars, 350-360 words) for '{filename}' using ONLY poetic, aesthetic language derived purely from this filename's essence.
-
-Requirements:
-- Write in third person, referring to the creator as “they” or “this person”, never using “I”, “me”, “my”, or “we”
-- Use MULTIPLE short paragraphs with blank lines between them (do NOT make one big block)
-- Strong hook; evocative story tied EXCLUSIVELY to '{filename}'; insightful close
-- Tell a descriptive, emotional story fully related to the filename '{filename}'
-- Add value/insight and relatable details
-- Sprinkle emojis naturally in each paragraph (not all at the end)
-- CTA question drawing from filename themes
-- Everything must stay under 1,800 characters including spaces/emojis/hashtags
-- Aesthetic, lyrical tone: metaphors, sensory details, rhythmic flow from '{filename}'
-- NO clichés/generic phrases—create ORIGINAL poetic imagery from '{filename}' words/themes ONLY
-
-CRITICAL HASHTAG REQUIREMENT:
-- You MUST generate exactly 5-10 hashtags at the very end
-- ALL hashtags MUST be directly related to the filename '{filename}' and the story content
-- Analyze the filename '{filename}' and create hashtags based on:
-  * The main topic/subject of the filename
-  * Key words or themes from the filename
-  * Related trending topics that match the filename context
-- NO generic hashtags like #love #instagood #photooftheday
-- Lyrical, sensory storytelling with filename-derived metaphors/rhythm
-- ONLY topic-specific hashtags that relate to '{filename}'
-- The hashtags should help people discover content about the same topic as '{filename}'
-
-Flow to follow (do NOT label the sections, just write the caption):
-- Hooky first line that makes people keep reading
-- 3–5 short paragraphs, each with 2–4 sentences, separated by blank lines
-- Descriptive story with context (what happened, who, where) plus emotional, relatable details - all based on '{filename}'
-- Engagement element with a question that invites replies
-- Call-to-action question at the end
-- Hashtags last (5-10, topic-specific) (NO generics)
-
-Generate only the caption text (no section labels, no extra notes). Keep it under 1,800 characters total, clearly paragraph-separated, and fully tied to the filename '{filename}' topic. Remember: Hashtags MUST be generated based on the filename '{filename}'."""
-            },
-            'facebook': {
-                'max_words': 480,
-                'max_chars': 3000,  # Facebook target cap: 2,000 characters
-                'hashtag_count': '5-10',
-                'prompt': f"""Act as a lyrical Facebook poet (2M+ followers) weaving aesthetic narratives. Create detailed Facebook caption for '{filename}' (≤2,000 chars, ~450 words) using poetic language drawn PURELY from filename essence.
-
-CRITICAL REQUIREMENTS:
-- Use only third‑person references (they / them / this person), and never use first‑person words like “I”, “me”, “my”, or “we”
-- Maximum 3,000 characters total (including hashtags)
-- Aim ~480 words (but stay under 2,000 chars)
-- End with exactly 5-10 targeted, topic-specific hashtags (no generic tags)
-- Lyrical, sensory storytelling with filename-derived metaphors/rhythm
-- NO clichés—ORIGINAL poetic expressions from '{filename}' themes/words ONLY
-- Include questions to encourage engagement
-- Add emojis strategically throughout paragraphs
-- Make it informative, shareable, and valuable
-- Hook; emotional filename journey; wisdom; 2 engagement questions
-- Do not exceed the character limit
-
-STRUCTURE (no labels, just text):
-- Hooky first line
-- 3–5 short paragraphs, 2–4 sentences each, separated by blank lines, 4-6 lyrical paragraphs
-- Emotional storytelling + relatable details
-- Engagement questions + call to action at the end
-- Hashtags last (5-10, topic-specific) (NO generics)
-
-Generate only the caption text."""
-            },
-            'threads': {
-                'max_words': 90,  # to target ~390 chars
-                'max_chars': 390,  # Strict limit per requirement
-                'hashtag_count': '2-3',
-                'prompt': f"""Act as poetic Threads whisperer. Craft aesthetic Threads post for '{filename}' (≤390 chars) using poetic essence from filename ONLY.
-
-CRITICAL REQUIREMENTS:
-- Always write in third person (“they / them / this person”), never in first person (“I / me / my / we”)
-- ABSOLUTE MAXIMUM: 390 characters total (including hashtags and spaces)
-- Start with a strong hook to grab attention immediately
-- Keep it conversational, engaging, and shareable
-- Lyrical, condensed poetry (under 390 chars total)
-- Make it punchy and viral-worthy
-- Add 1-2 emojis if they fit naturally
-
-CRITICAL HASHTAG REQUIREMENT:
-- You MUST generate exactly 2-3 hashtags at the very end
-- ALL hashtags MUST be directly related to the filename '{filename}' and the post content
-- Analyze the filename '{filename}' and create hashtags based on:
-  * The main topic/subject of the filename
-  * Key words or themes from the filename
-  * Related trending topics that match the filename context
-- NO generic hashtags
-- Hook + poetic essence + 2-3 '{filename}' hashtags
-- ONLY topic-specific hashtags that relate to '{filename}'
-- The hashtags should help people discover content about the same topic as '{filename}'
-
-STRUCTURE:
-- Hook (first line grabs attention)
-- Main message (concise and impactful, related to '{filename}')
-- 2-3 hashtags at the end (MUST be related to filename '{filename}')
-
-IMPORTANT: Count characters carefully. The total must be UNDER 390 characters including all spaces, punctuation, and hashtags.
-
-Generate only the caption text, nothing else. Keep it short and powerful. Remember: Hashtags MUST be generated based on the filename '{filename}'."""
-            }
-        }
-        
-        captions = {}
-        
-        for platform, config in platforms.items():
-            try:
-                self.log_console_only(f"🤖 Generating {platform} caption using AI for: '{filename}'...", level=logging.INFO)
-                self.send_message(f"🤖 Generating {platform} caption...", level=logging.INFO, immediate=True)
-                
-                # Make API call with better error handling
-                try:
-                    # Try multiple model names in case one doesn't work
-                    models_to_try = [
-                        "llama-3.1-8b-instant",  # Fast, recommended
-                        "llama3-8b-8192",  # Alternative name
-                        "llama-3.1-70b-versatile",  # More powerful fallback
-                    ]
-                    
-                    response = None
-                    last_error = None
-                    
-                    for model_name in models_to_try:
-                        try:
-                            self.log_console_only(f"🔄 Trying model: {model_name}", level=logging.INFO)
-                            # Adjust max_tokens based on platform
-                            if platform == 'threads':
-                                max_tokens = 180  # Lower for Threads (shorter content, 390 chars)
-                            elif platform == 'facebook':
-                                max_tokens = 3500  # For ~2000 chars
-                            else:
-                                max_tokens = 2000  # Instagram (~1800 chars)
-                            
-                            response = groq_client.chat.completions.create(
-                                model=model_name,
-                                messages=[{"role": "user", "content": config['prompt']}],
-                                temperature=0.7,
-                                max_tokens=max_tokens
-                            )
-                            self.log_console_only(f"✅ Successfully used model: {model_name}", level=logging.INFO)
-                            break  # Success, exit loop
-                        except Exception as model_error:
-                            last_error = model_error
-                            self.log_console_only(f"⚠️ Model {model_name} failed: {str(model_error)}", level=logging.WARNING)
-                            continue  # Try next model
-                    
-                    if response is None:
-                        raise Exception(f"All models failed. Last error: {str(last_error)}")
-                    
-                    # Validate response
-                    if not response or not response.choices:
-                        raise Exception("Empty response from Groq API")
-                    
-                    if not response.choices[0].message.content:
-                        raise Exception("No content in response")
-                    
-                    caption = response.choices[0].message.content.strip()
-                    
-                    # Validate caption is not empty
-                    if not caption or len(caption.strip()) == 0:
-                        raise Exception("Generated caption is empty")
-                    
-                    # Remove any markdown formatting if present
-                    caption = caption.replace('```', '').replace('```markdown', '').replace('```text', '').strip()
-                    
-                    # Remove leading/trailing quotes if AI added them
-                    if caption.startswith('"') and caption.endswith('"'):
-                        caption = caption[1:-1]
-                    if caption.startswith("'") and caption.endswith("'"):
-                        caption = caption[1:-1]
-                    
-                    # Strict character limit enforcement (especially for Threads and Instagram)
-                    if platform == 'threads':
-                        # Threads strict limit: 390 chars target
-                        max_allowed = 360  # buffer for safety
-                        if len(caption) > max_allowed:
-                            # Truncate at word boundary
-                            truncated = caption[:max_allowed-10]
-                            last_space = truncated.rfind(' ')
-                            last_hashtag = truncated.rfind('#')
-                            
-                            # Try to preserve hashtags if they're near the end
-                            if last_hashtag > last_space and last_hashtag > max_allowed - 50:
-                                # Keep hashtags, truncate before them
-                                caption = truncated[:last_hashtag].rstrip() + " " + caption[last_hashtag:max_allowed].rstrip()
-                            elif last_space > 0:
-                                caption = truncated[:last_space].rstrip()
-                            else:
-                                caption = truncated.rstrip()
-                            
-                            # Final safety check - must be under 500
-                            if len(caption) >= 500:
-                                caption = caption[:495].rstrip()
-                            
-                            self.log_console_only(f"⚠️ Threads caption truncated to {len(caption)} chars (limit: 500)", level=logging.WARNING)
-                    elif platform == 'instagram':
-                        # Instagram target limit: 1,800 chars
-                        max_allowed = 1700  # buffer for safety
-                        if len(caption) > max_allowed:
-                            # Truncate at word boundary, try to preserve hashtags
-                            truncated = caption[:max_allowed-20]
-                            last_space = truncated.rfind(' ')
-                            last_hashtag = truncated.rfind('#')
-                            
-                            # Try to preserve hashtags if they're near the end
-                            if last_hashtag > last_space and last_hashtag > max_allowed - 100:
-                                # Keep hashtags, truncate before them
-                                main_text = truncated[:last_hashtag].rstrip()
-                                hashtags = caption[last_hashtag:]
-                                # Ensure total is under limit
-                                if len(main_text) + len(hashtags) <= 2000:
-                                    caption = main_text + " " + hashtags
-                                else:
-                                    # Hashtags too long, truncate them too
-                                    available = 2000 - len(main_text) - 1
-                                    caption = main_text + " " + hashtags[:available].rstrip()
-                            elif last_space > 0:
-                                caption = truncated[:last_space].rstrip()
-                            else:
-                                caption = truncated.rstrip()
-                            
-                            # Final safety check - must be under 1,800
-                            if len(caption) >= 1800:
-                                caption = caption[:1795].rstrip()
-                            
-                            self.log_console_only(f"⚠️ Instagram caption truncated to {len(caption)} chars (limit: 2,000)", level=logging.WARNING)
-                    elif len(caption) > config['max_chars']:
-                        # For other platforms (Facebook), truncate at word boundary
-                        truncated = caption[:config['max_chars']-50]
-                        last_space = truncated.rfind(' ')
-                        if last_space > 0:
-                            caption = truncated[:last_space] + "..."
-                        else:
-                            caption = truncated + "..."
-                    
-                    # Final validation for Threads - must be under 390
-                    if platform == 'threads' and len(caption) >= 390:
-                        self.log_console_only(f"⚠️ Threads caption still too long ({len(caption)} chars), forcing truncation", level=logging.WARNING)
-                        caption = caption[:385].rstrip()
-                    
-                    # Final validation for Instagram - must be under 1,800
-                    if platform == 'instagram' and len(caption) >= 1800:
-                        self.log_console_only(f"⚠️ Instagram caption still too long ({len(caption)} chars), forcing truncation", level=logging.WARNING)
-                        caption = caption[:1795].rstrip()
-                    
-                    captions[platform] = caption
-                    
-                    preview = caption[:150] + "..." if len(caption) > 150 else caption
-                    self.log_console_only(f"✅ AI generated {platform} caption ({len(caption)} chars): {preview}", level=logging.INFO)
-                    self.send_message(f"✅ {platform.capitalize()} caption generated ({len(caption)} chars)", level=logging.INFO, immediate=True)
-                    
-                except Exception as api_error:
-                    error_msg = f"{type(api_error).__name__}: {str(api_error)}"
-                    self.log_console_only(f"❌ Groq API call failed for {platform}: {error_msg}", level=logging.ERROR)
-                    self.send_message(f"❌ Groq AI failed for {platform}: {error_msg}", level=logging.ERROR, immediate=True)
-                    # Fallback to simple filename-based caption
-                    captions[platform] = self.build_caption_from_filename(file)
-                    self.log_console_only(f"⚠️ Using fallback caption for {platform}", level=logging.WARNING)
-                
-            except Exception as e:
-                error_msg = f"{type(e).__name__}: {str(e)}"
-                self.log_console_only(f"❌ Unexpected error for {platform}: {error_msg}", level=logging.ERROR)
-                self.send_message(f"❌ Error generating {platform} caption: {error_msg}", level=logging.ERROR, immediate=True)
-                # Fallback to simple filename-based caption
-                captions[platform] = self.build_caption_from_filename(file)
-        
-        # Final validation - check if we got any AI-generated captions
-        ai_generated_count = sum(1 for cap in captions.values() if cap != self.build_caption_from_filename(file))
-        
-        # CRITICAL: Final validation for Threads character limit
-        if 'threads' in captions:
-            threads_caption = captions['threads']
-            if len(threads_caption) >= 500:
-                self.log_console_only(f"⚠️ CRITICAL: Threads caption exceeds limit ({len(threads_caption)} chars). Forcing truncation.", level=logging.ERROR)
-                # Aggressively truncate
-                threads_caption = threads_caption[:450].rstrip()
-                # Try to preserve hashtags if they exist
-                last_hashtag = threads_caption.rfind('#')
-                if last_hashtag > 400:
-                    # Hashtags are near the end, keep them
-                    main_text = threads_caption[:last_hashtag].rstrip()
-                    hashtags = threads_caption[last_hashtag:]
-                    if len(main_text) + len(hashtags) < 500:
-                        captions['threads'] = main_text + " " + hashtags
-                    else:
-                        captions['threads'] = threads_caption[:495].rstrip()
-                else:
-                    captions['threads'] = threads_caption[:495].rstrip()
-                
-                self.log_console_only(f"✅ Threads caption fixed: {len(captions['threads'])} chars", level=logging.INFO)
-        
-        # CRITICAL: Final validation for Instagram character limit (≤1800)
-        if 'instagram' in captions:
-            instagram_caption = captions['instagram']
-            if len(instagram_caption) >= 1800:
-                self.log_console_only(f"⚠️ CRITICAL: Instagram caption exceeds limit ({len(instagram_caption)} chars). Forcing truncation.", level=logging.ERROR)
-                # Aggressively truncate
-                instagram_caption = instagram_caption[:1750].rstrip()
-                # Try to preserve hashtags if they exist
-                last_hashtag = instagram_caption.rfind('#')
-                if last_hashtag > 1650:
-                    # Hashtags are near the end, keep them
-                    main_text = instagram_caption[:last_hashtag].rstrip()
-                    hashtags = instagram_caption[last_hashtag:]
-                    if len(main_text) + len(hashtags) < 1800:
-                        captions['instagram'] = main_text + " " + hashtags
-                    else:
-                        # Hashtags too long, truncate them too
-                        available = 1800 - len(main_text) - 1
-                        captions['instagram'] = main_text + " " + hashtags[:available].rstrip()
-                else:
-                    captions['instagram'] = instagram_caption[:1795].rstrip()
-                
-                self.log_console_only(f"✅ Instagram caption fixed: {len(captions['instagram'])} chars", level=logging.INFO)
+            captions = {platform: caption or fallback_caption for platform, caption in captions.items()}
         
         if ai_generated_count == 0:
             self.send_message("⚠️ No AI captions generated. All platforms using fallback captions.", level=logging.WARNING, immediate=True)
@@ -501,57 +582,181 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                 char_counts.append(f"{platform}: {len(caption)} chars")
             self.send_message(f"✅ Successfully generated {ai_generated_count}/3 AI captions\n{' | '.join(char_counts)}", level=logging.INFO, immediate=True)
         
+        self.remember_groq_model()
+        
+        # Only fully AI-generated sets are cached, so a fallback caption gets another try next run
+        if ai_generated_count == len(captions):
+            stored = self.load_disk_cache().get("captions", {})
+            stored[cache_key] = captions
+            while len(stored) > self.CAPTION_CACHE_MAX_ENTRIES:
+                stored.pop(next(iter(stored)))
+            self.save_disk_cache(captions=stored)
+        
         return captions
 
+    def generate_combined_captions(self, groq_client, filename):
+        """
+        Generate all three captions with a single JSON-mode Groq request.
+
+        Returns:
+            dict: Cleaned and truncated caption per platform, or None if the request or its JSON
+            was unusable (the caller then generates each caption separately). On an auth failure
+            every platform maps to None, since per-platform requests would fail the same way.
+        """
+        self.log_console_only(f"🤖 Generating all captions in one request for: '{filename}'...", level=logging.INFO)
+        model_name = self.groq_models()[0]
+        try:
+            response = groq_client.chat.completions.create(
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": _COMBINED_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"Filename: '{filename}'"},
+                ],
+                temperature=0.7,
+                max_tokens=sum(config['max_tokens'] for config in self.CAPTION_PLATFORMS.values()),
+                response_format={"type": "json_object"}
+            )
+            data = json.loads(response.choices[0].message.content)
+            self._groq_model = model_name
+        except Exception as e:
+            if getattr(e, 'status_code', None) in (401, 403):
+                self.log_console_only(f"❌ Groq rejected the API key: {type(e).__name__}: {e}", level=logging.ERROR)
+                return dict.fromkeys(self.CAPTION_PLATFORMS)
+            self.log_console_only(f"⚠️ Combined caption request failed, generating per platform: {type(e).__name__}: {e}", level=logging.WARNING)
+            return None
+        
+        captions = {}
+        for platform, config in self.CAPTION_PLATFORMS.items():
+            caption = data.get(platform) if isinstance(data, dict) else None
+            caption = _clean_caption(caption) if isinstance(caption, str) else ""
+            if not caption:
+                self.log_console_only(f"⚠️ Combined caption response has no {platform} caption, generating per platform", level=logging.WARNING)
+                return None
+            captions[platform] = _truncate_caption(caption, config['truncate_at'])
+        
+        self.log_console_only("✅ Generated all captions in one request (%s)", ", ".join(f"{p}: {len(c)} chars" for p, c in captions.items()), level=logging.INFO)
+        return captions
+
+    def generate_platform_caption(self, groq_client, filename, platform, config):
+        """Generate one platform's caption with Groq. Returns None on failure so the caller can fall back."""
+        try:
+            self.log_console_only(f"🤖 Generating {platform} caption using AI for: '{filename}'...", level=logging.INFO)
+            self.send_message(f"🤖 Generating {platform} caption...", level=logging.INFO, immediate=True)
+            
+            # Make API call with better error handling
+            try:
+                # Try multiple model names in case one doesn't work
+                response = None
+                last_error = None
+                
+                for model_name in self.groq_models():
+                    try:
+                        self.log_console_only(f"🔄 Trying model: {model_name}", level=logging.INFO)
+                        response = groq_client.chat.completions.create(
+                            model=model_name,
+                            messages=[
+                                {"role": "system", "content": config['system_prompt']},
+                                {"role": "user", "content": f"Filename: '{filename}'"},
+                            ],
+                            temperature=0.7,
+                            max_tokens=config['max_tokens']
+                        )
+                        self.log_console_only(f"✅ Successfully used model: {model_name}", level=logging.INFO)
+                        self._groq_model = model_name
+                        details = getattr(getattr(response, 'usage', None), 'prompt_tokens_details', None)
+                        cached_tokens = getattr(details, 'cached_tokens', None)
+                        if cached_tokens is not None:
+                            self.log_console_only("💾 %s prompt cache: %s cached tokens", platform, cached_tokens, level=logging.INFO)
+                        break  # Success, exit loop
+                    except Exception as model_error:
+                        last_error = model_error
+                        self.log_console_only(f"⚠️ Model {model_name} failed: {str(model_error)}", level=logging.WARNING)
+                        # Auth failures are identical for every model; the SDK already retried 429/5xx
+                        if getattr(model_error, 'status_code', None) in (401, 403):
+                            break
+                        continue  # Try next model
+                
+                if response is None:
+                    raise Exception(f"All models failed. Last error: {str(last_error)}")
+                
+                # Validate response
+                if not response or not response.choices:
+                    raise Exception("Empty response from Groq API")
+                
+                if not response.choices[0].message.content:
+                    raise Exception("No content in response")
+                
+                # Strip fences and wrapping quotes in one pass before validating
+                caption = _clean_caption(response.choices[0].message.content)
+                if not caption:
+                    raise Exception("Generated caption is empty")
+                
+                # Enforce the platform limit at a word boundary, keeping trailing hashtags
+                limited = _truncate_caption(caption, config['truncate_at'])
+                if len(limited) < len(caption):
+                    self.log_console_only("⚠️ %s caption truncated from %d to %d chars", platform, len(caption), len(limited), level=logging.WARNING)
+                caption = limited
+                
+                preview = caption[:150] + "..." if len(caption) > 150 else caption
+                self.log_console_only(f"✅ AI generated {platform} caption ({len(caption)} chars): {preview}", level=logging.INFO)
+                self.send_message(f"✅ {platform.capitalize()} caption generated ({len(caption)} chars)", level=logging.INFO, immediate=True)
+                return caption
+                
+            except Exception as api_error:
+                error_msg = f"{type(api_error).__name__}: {str(api_error)}"
+                self.log_console_only(f"❌ Groq API call failed for {platform}: {error_msg}", level=logging.ERROR)
+                self.send_message(f"❌ Groq AI failed for {platform}: {error_msg}", level=logging.ERROR, immediate=True)
+                # Caller substitutes the simple filename-based caption
+                self.log_console_only(f"⚠️ Using fallback caption for {platform}", level=logging.WARNING)
+                return None
+            
+        except Exception as e:
+            error_msg = f"{type(e).__name__}: {str(e)}"
+            self.log_console_only(f"❌ Unexpected error for {platform}: {error_msg}", level=logging.ERROR)
+            self.send_message(f"❌ Error generating {platform} caption: {error_msg}", level=logging.ERROR, immediate=True)
+            # Caller substitutes the simple filename-based caption
+            return None
+
+    @_ttl_cached("_page_token_cache", "PAGE_TOKEN_CACHE_TTL")
     def get_page_access_token(self):
         """Fetch Facebook Page Access Token."""
         try:
             self.log_console_only("🔐 Fetching Page Access Token from Meta API...", level=logging.INFO)
-            url = f"https://graph.facebook.com/v18.0/me/accounts"
-            params = {"access_token": self.meta_token}
+            # Ask for the one page directly instead of scanning every page in /me/accounts
+            url = f"https://graph.facebook.com/v18.0/{self.fb_page_id}"
+            params = {"fields": "access_token,name", "access_token": self.meta_token}
             
             self.log_console_only(f"📡 API URL: {url}", level=logging.INFO)
             
-            start_time = time.time()
+            start_time = time.monotonic()
             res = self.session.get(url, params=params)
-            request_time = time.time() - start_time
+            request_time = time.monotonic() - start_time
             
             self.log_console_only(f"⏱️ Page token request completed in {request_time:.2f} seconds", level=logging.INFO)
             self.log_console_only(f"📊 Response status: {res.status_code}", level=logging.INFO)
 
             if res.status_code != 200:
-                self.send_message(f"❌ Failed to fetch Page token: {res.text}", level=logging.ERROR, immediate=True)
+                self.send_message(f"❌ Failed to fetch Page token for Page ID {self.fb_page_id}: {res.text}", level=logging.ERROR, immediate=True)
                 return None
 
-            pages = res.json().get("data", [])
-            self.log_console_only(f"🔍 Found {len(pages)} pages in user account", level=logging.INFO)
+            page = self.response_json(res)
+            page_name = page.get("name", "Unknown")
+            page_access_token = page.get("access_token")
+            self.log_console_only(f"✅ Target page: {page_name}", level=logging.INFO)
             
-            # Find the target page
-            for page in pages:
-                page_id = page.get("id", "Unknown")
-                page_name = page.get("name", "Unknown")
-                page_access_token = page.get("access_token", "Not available")
-                
-                if page_id == self.fb_page_id:
-                    self.log_console_only(f"✅ MATCH FOUND! Target page: {page_name}", level=logging.INFO)
-                    
-                    if page_access_token and page_access_token != "Not available":
-                        self.send_message(f"✅ Page Access Token fetched for: {page_name} (ID: {self.fb_page_id})", immediate=True)
-                        self.log_console_only(f"🔐 Using page access token: {page_access_token[:20]}...", level=logging.INFO)
-                        return page_access_token
-                    else:
-                        self.send_message(f"❌ No access token found for page: {page_name}", level=logging.ERROR, immediate=True)
-                        return None
-
-            self.send_message(f"⚠️ Page ID {self.fb_page_id} not found in user's account list.", level=logging.ERROR, immediate=True)
-            return None
+            if not page_access_token:
+                self.send_message(f"❌ No access token found for page: {page_name}", level=logging.ERROR, immediate=True)
+                return None
+            
+            self.send_message(f"✅ Page Access Token fetched for: {page_name} (ID: {self.fb_page_id})", immediate=True)
+            self.log_console_only(f"🔐 Using page access token: {page_access_token[:20]}...", level=logging.INFO)
+            return page_access_token
         except Exception as e:
             self.send_message(f"❌ Exception during Page token fetch: {e}", level=logging.ERROR, immediate=True)
             return None
 
     def get_dropbox_video_metadata(self, dbx, file):
         """Get width, height, duration from Dropbox file metadata."""
-        from dropbox.files import VideoMetadata, PhotoMetadata
         metadata = dbx.files_get_metadata(file.path_lower, include_media_info=True)
         if hasattr(metadata, 'media_info') and metadata.media_info:
             info = metadata.media_info.get_metadata()
@@ -560,10 +765,9 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             if getattr(info, 'dimensions', None) is not None:
                 width = info.dimensions.width
                 height = info.dimensions.height
-            if isinstance(info, VideoMetadata):
-                duration = info.duration / 1000.0  # ms to seconds
-            else:
-                duration = None
+            # Only video metadata carries a duration; photos come back without one
+            duration_ms = getattr(info, 'duration', None)
+            duration = duration_ms / 1000.0 if duration_ms is not None else None  # ms to seconds
             return width, height, duration
         return None, None, None
 
@@ -575,19 +779,14 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         if width is None or height is None or duration is None:
             return False
         
-        aspect_ratio = width / height
-        
-        # Facebook Reel requirements
-        min_height = 960
-        min_width = 540
-        max_height = 1920
-        max_width = 1080
-        max_duration = 90
-        min_duration = 3
+        min_width, min_height = self.FB_REEL_MIN_SIZE
+        max_width, max_height = self.FB_REEL_MAX_SIZE
+        min_duration, max_duration = self.FB_REEL_DURATION
         
-        # Check portrait orientation (height > width) and aspect ratio
+        # Check portrait orientation (height > width) and 9:16 aspect ratio within 0.01, in integers:
+        # |w/h - 9/16| < 0.01  <=>  |1600w - 900h| < 16h
         is_portrait = height > width
-        is_valid_ratio = abs(aspect_ratio - 0.5625) < 0.01  # 9:16
+        is_valid_ratio = abs(1600 * width - 900 * height) < 16 * height
         
         meets_minimum_size = height >= min_height and width >= min_width
         meets_maximum_size = height <= max_height and width <= max_width
@@ -595,35 +794,31 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         
         result = is_portrait and is_valid_ratio and meets_minimum_size and meets_maximum_size and meets_duration
         
-        self.log_console_only(
-            f"📐 Facebook Reel Check:\n"
-            f"   Size: {width}x{height} (portrait: {is_portrait})\n"
-            f"   Min Size: {min_width}x{min_height} ✓ {meets_minimum_size}\n"
-            f"   Max Size: {max_width}x{max_height} ✓ {meets_maximum_size}\n"
-            f"   Aspect Ratio: {aspect_ratio:.4f} (valid: {is_valid_ratio})\n"
-            f"   Duration: {duration}s (min: {min_duration}s, max: {max_duration}s, valid: {meets_duration})\n"
-            f"   Meets all requirements: {result}",
-            level=logging.INFO
-        )
+        if self.logger.isEnabledFor(logging.INFO):
+            self.log_console_only("\n".join([
+                "📐 Facebook Reel Check:",
+                f"   Size: {width}x{height} (portrait: {is_portrait})",
+                f"   Min Size: {min_width}x{min_height} ✓ {meets_minimum_size}",
+                f"   Max Size: {max_width}x{max_height} ✓ {meets_maximum_size}",
+                f"   Aspect Ratio: {width / height:.4f} (valid: {is_valid_ratio})",
+                f"   Duration: {duration}s (min: {min_duration}s, max: {max_duration}s, valid: {meets_duration})",
+                f"   Meets all requirements: {result}",
+            ]), level=logging.INFO)
         
         return result
 
-    def post_to_instagram(self, dbx, file, caption, page_token, total_files=None):
+    def post_to_instagram(self, file, temp_link, caption, page_token, total_files):
         """Post to Instagram using the provided page token."""
         name = file.name
-        ext = name.lower()
-        media_type = "REELS" if ext.endswith((".mp4", ".mov")) else "IMAGE"
+        media_type = "REELS" if _ext(name) in self.VIDEO_EXTS else "IMAGE"
 
         self.send_message(f"🚀 Starting Instagram upload: {name}", level=logging.INFO, immediate=True)
         
-        temp_link = dbx.files_get_temporary_link(file.path_lower).link
         file_size = f"{file.size / 1024 / 1024:.2f}MB"
-        if total_files is None:
-            total_files = len(self.list_dropbox_files(dbx))
 
         self.log_console_only(f"📸 Instagram: {media_type} | Size: {file_size} | Remaining: {total_files}")
 
-        upload_url = f"{self.INSTAGRAM_API_BASE}/{self.ig_id}/media"
+        upload_url = self.ig_media_url
         data = {
             "access_token": page_token,
             "caption": caption
@@ -635,104 +830,74 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             data["image_url"] = temp_link
 
         self.log_console_only("🔄 Creating Instagram media container...", level=logging.INFO)
-        start_time = time.time()
+        start_time = time.monotonic()
         res = self.session.post(upload_url, data=data)
-        request_time = time.time() - start_time
+        request_time = time.monotonic() - start_time
         
         self.log_console_only(f"⏱️ API request completed in {request_time:.2f} seconds", level=logging.INFO)
         self.log_console_only(f"📊 Response status: {res.status_code}", level=logging.INFO)
+        body = self.response_json(res)
         
         if res.status_code != 200:
-            err = res.json().get("error", {}).get("message", "Unknown")
+            err = body.get("error", {}).get("message", "Unknown")
             self.send_message(f"❌ Instagram upload failed: {err}", level=logging.ERROR, immediate=True)
             return False
 
-        creation_id = res.json().get("id")
+        creation_id = body.get("id")
         if not creation_id:
             self.send_message(f"❌ No media ID returned for: {name}", level=logging.ERROR, immediate=True)
             return False
 
         self.log_console_only(f"✅ Media creation successful! Creation ID: {creation_id}", level=logging.INFO)
 
-        # For REELS, poll status
+        # Container status lookups (token goes in params so it stays out of logged URLs)
+        status_url = f"{self.INSTAGRAM_API_BASE}/{creation_id}"
+        status_params = {"fields": "status_code", "access_token": page_token}
+
+        # For REELS, poll status. Image containers are normally ready at once, so images are published
+        # speculatively; on "not available" the publish loop re-checks the container and keeps
+        # retrying until PUBLISH_MAX_WAIT_TIME, so a slow image still gets the full publish budget
         if media_type == "REELS":
             self.log_console_only("⏳ Processing video for Instagram...", level=logging.INFO)
-            processing_start = time.time()
+            processing_start = time.monotonic()
             for attempt in range(self.INSTAGRAM_REEL_STATUS_RETRIES):
                 self.log_console_only(f"🔄 Processing attempt {attempt + 1}/{self.INSTAGRAM_REEL_STATUS_RETRIES}", level=logging.INFO)
                 
-                status_response = self.session.get(
-                    f"{self.INSTAGRAM_API_BASE}/{creation_id}?fields=status_code&access_token={page_token}"
-                )
+                status_response = self.session.get(status_url, params=status_params)
                 
                 if status_response.status_code != 200:
                     self.send_message(f"❌ Status check failed: {status_response.status_code}", level=logging.ERROR, immediate=True)
                     return False
                 
-                status = status_response.json()
+                status = self.response_json(status_response)
                 current_status = status.get("status_code", "UNKNOWN")
                 
                 self.log_console_only(f"📊 Current status: {current_status}", level=logging.INFO)
                 
                 if current_status == "FINISHED":
-                    processing_time = time.time() - processing_start
+                    processing_time = time.monotonic() - processing_start
                     self.log_console_only(f"✅ Video processing completed in {processing_time:.2f} seconds!", level=logging.INFO)
-                    self.log_console_only("⏳ Waiting 15 seconds before publishing...", level=logging.INFO)
-                    time.sleep(15)
                     break
                 elif current_status == "ERROR":
                     self.send_message(f"❌ Instagram processing failed: {name}", level=logging.ERROR, immediate=True)
                     return False
                 
-                self.log_console_only(f"⏳ Waiting {self.INSTAGRAM_REEL_STATUS_WAIT_TIME} seconds...", level=logging.INFO)
-                time.sleep(self.INSTAGRAM_REEL_STATUS_WAIT_TIME)
-        else:
-            # For IMAGES, check status and wait a bit before publishing
-            self.log_console_only("⏳ Verifying image container is ready...", level=logging.INFO)
-            time.sleep(3)  # Small delay for image processing
-            
-            # Check container status before publishing
-            for check_attempt in range(3):
-                status_response = self.session.get(
-                    f"{self.INSTAGRAM_API_BASE}/{creation_id}?fields=status_code&access_token={page_token}"
-                )
-                
-                if status_response.status_code == 200:
-                    status = status_response.json()
-                    current_status = status.get("status_code", "UNKNOWN")
-                    self.log_console_only(f"📊 Image container status: {current_status}", level=logging.INFO)
-                    
-                    if current_status == "FINISHED":
-                        self.log_console_only("✅ Image container ready for publishing", level=logging.INFO)
-                        break
-                    elif current_status == "ERROR":
-                        self.send_message(f"❌ Instagram image container error: {name}", level=logging.ERROR, immediate=True)
-                        return False
-                    elif current_status == "IN_PROGRESS":
-                        if check_attempt < 2:
-                            self.log_console_only("⏳ Image still processing, waiting 2 seconds...", level=logging.INFO)
-                            time.sleep(2)
-                            continue
-                
-                # If status check fails, log but continue (some containers don't return status)
-                if check_attempt == 0:
-                    self.log_console_only("⚠️ Could not check container status, proceeding with publish...", level=logging.WARNING)
-                    break
-            
-            # Additional wait before publishing images
-            self.log_console_only("⏳ Waiting 2 seconds before publishing image...", level=logging.INFO)
-            time.sleep(2)
+                delay = self.backoff_delay(attempt, self.INSTAGRAM_REEL_STATUS_BASE_WAIT, self.INSTAGRAM_REEL_STATUS_WAIT_TIME)
+                self.log_console_only(f"⏳ Waiting {delay:.1f} seconds...", level=logging.INFO)
+                time.sleep(delay)
 
         # Publish to Instagram with retry logic
         self.log_console_only("📤 Publishing to Instagram...", level=logging.INFO)
-        publish_url = f"{self.INSTAGRAM_API_BASE}/{self.ig_id}/media_publish"
+        publish_url = self.ig_publish_url
         publish_data = {"creation_id": creation_id, "access_token": page_token}
         
-        start_time = time.time()
+        deadline = time.monotonic() + self.PUBLISH_MAX_WAIT_TIME
+        attempt = 0    # Failed publishes; "not available" responses don't use up INSTAGRAM_PUBLISH_ATTEMPTS
+        not_ready = 0  # "Not available" responses so far, for the container backoff
         
-        for attempt in range(self.INSTAGRAM_PUBLISH_ATTEMPTS):
+        while attempt < self.INSTAGRAM_PUBLISH_ATTEMPTS:
             # Check timeout
-            if time.time() - start_time > self.PUBLISH_MAX_WAIT_TIME:
+            if time.monotonic() > deadline:
                 self.send_message(f"❌ Instagram publish timeout after {self.PUBLISH_MAX_WAIT_TIME}s", level=logging.ERROR, immediate=True)
                 return False
             
@@ -741,9 +906,9 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             pub = self.session.post(publish_url, data=publish_data)
             
             self.log_console_only(f"📊 Publish status: {pub.status_code}", level=logging.INFO)
+            response_data = self.response_json(pub)
             
             if pub.status_code == 200:
-                response_data = pub.json()
                 instagram_id = response_data.get("id", "Unknown")
                 
                 if not instagram_id:
@@ -751,11 +916,11 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                     return False
                 else:
                     self.send_message(f"✅ Instagram published!\n📸 Media ID: {instagram_id}\n📦 Remaining: {total_files - 1}", immediate=True)
-                    # Verify the post is live
-                    self.verify_instagram_post_by_media_id(instagram_id, page_token)
+                    # Verify the post is live; observational, so it runs off the critical path
+                    self.run_in_background(self.verify_post, "Instagram", instagram_id, page_token)
                     return True
             else:
-                error_data = pub.json().get("error", {})
+                error_data = response_data.get("error", {})
                 error_msg = error_data.get("message", "Unknown error")
                 error_code = error_data.get("code", "Unknown")
                 error_type = self.classify_error(pub.status_code)
@@ -766,34 +931,38 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                     level=logging.INFO
                 )
                 
-                # Special handling for "Media ID is not available" error
-                if "Media ID is not available" in error_msg or "not available" in error_msg.lower():
+                # Special handling for "Media ID is not available" (code 9007): the container isn't ready yet.
+                # These retries are bounded by the publish deadline rather than the attempt count.
+                if error_code == 9007 or "not available" in error_msg.lower():
                     self.log_console_only("⚠️ Media ID not available - container may not be ready yet", level=logging.WARNING)
                     
                     # Check container status before retrying
-                    if attempt < self.INSTAGRAM_PUBLISH_ATTEMPTS - 1:
-                        self.log_console_only("🔍 Checking container status before retry...", level=logging.INFO)
-                        status_check = self.session.get(
-                            f"{self.INSTAGRAM_API_BASE}/{creation_id}?fields=status_code&access_token={page_token}"
-                        )
+                    self.log_console_only("🔍 Checking container status before retry...", level=logging.INFO)
+                    status_check = self.session.get(status_url, params=status_params)
+                    backoff_step = not_ready
+                    
+                    if status_check.status_code == 200:
+                        status_data = self.response_json(status_check)
+                        container_status = status_data.get("status_code", "UNKNOWN")
+                        self.log_console_only(f"📊 Container status: {container_status}", level=logging.INFO)
                         
-                        if status_check.status_code == 200:
-                            status_data = status_check.json()
-                            container_status = status_data.get("status_code", "UNKNOWN")
-                            self.log_console_only(f"📊 Container status: {container_status}", level=logging.INFO)
-                            
-                            if container_status == "ERROR":
-                                self.send_message(f"❌ Instagram container error: {name}", level=logging.ERROR, immediate=True)
-                                return False
-                            elif container_status == "IN_PROGRESS":
-                                self.log_console_only("⏳ Container still processing, waiting longer...", level=logging.INFO)
-                                time.sleep(10)  # Wait longer if still processing
-                            else:
-                                time.sleep(5)  # Wait before retry
-                        else:
-                            self.log_console_only("⚠️ Could not check container status, waiting before retry...", level=logging.WARNING)
-                            time.sleep(8)  # Wait longer if status check fails
-                        continue
+                        if container_status == "ERROR":
+                            self.send_message(f"❌ Instagram container error: {name}", level=logging.ERROR, immediate=True)
+                            return False
+                        elif container_status == "IN_PROGRESS":
+                            self.log_console_only("⏳ Container still processing, waiting longer...", level=logging.INFO)
+                            backoff_step += 1
+                    else:
+                        self.log_console_only("⚠️ Could not check container status, waiting before retry...", level=logging.WARNING)
+                    not_ready += 1
+                    # Usually ready within a second or two, so start short and back off
+                    delay = self.backoff_delay(backoff_step, self.INSTAGRAM_NOT_READY_BASE_WAIT, self.INSTAGRAM_NOT_READY_MAX_WAIT)
+                    if time.monotonic() + delay > deadline:
+                        self.send_message(f"❌ Instagram container not ready after {self.PUBLISH_MAX_WAIT_TIME}s: {name}", level=logging.ERROR, immediate=True)
+                        return False
+                    self.log_console_only(f"⏳ Retrying in {delay:.1f}s...", level=logging.INFO)
+                    time.sleep(delay)
+                    continue
                 
                 # Don't retry permanent errors or if it's the last attempt
                 if error_type == "permanent" or attempt == self.INSTAGRAM_PUBLISH_ATTEMPTS - 1:
@@ -801,17 +970,16 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                     return False
                 
                 # Wait before retry
-                if attempt < self.INSTAGRAM_PUBLISH_ATTEMPTS - 1:
-                    self.log_console_only(f"⏳ Retrying in {self.PUBLISH_RETRY_INTERVAL}s...", level=logging.INFO)
-                    time.sleep(self.PUBLISH_RETRY_INTERVAL)
+                delay = self.publish_retry_delay(pub, attempt)
+                self.log_console_only(f"⏳ Retrying in {delay:.1f}s...", level=logging.INFO)
+                time.sleep(delay)
+                attempt += 1
         
         self.send_message(f"❌ Instagram publish failed after {self.INSTAGRAM_PUBLISH_ATTEMPTS} attempts", level=logging.ERROR, immediate=True)
         return False
 
-    def post_to_facebook_page(self, dbx, file, caption, page_token):
+    def post_to_facebook_page(self, dbx, file, media_url, caption, page_token):
         """Post to Facebook with conditional Reel/Video logic based on orientation requirements."""
-        media_url = dbx.files_get_temporary_link(file.path_lower).link
-        
         if not self.fb_page_id:
             self.send_message("⚠️ Facebook Page ID not configured, skipping Facebook post", level=logging.WARNING, immediate=True)
             return False
@@ -824,8 +992,7 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                 return False
 
         # Check if file is image or video
-        image_exts = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp')
-        is_image = file.name.lower().endswith(image_exts)
+        is_image = _ext(file.name) in self.IMAGE_EXTS
         
         if is_image:
             # Post image as photo
@@ -847,7 +1014,7 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         self.log_console_only("📘 Starting Facebook Reel upload...", level=logging.INFO)
         
         # Step 1: Start upload session
-        start_url = f"https://graph.facebook.com/v23.0/{self.fb_page_id}/video_reels"
+        start_url = self.fb_reels_url
         start_data = {"upload_phase": "start", "access_token": page_token}
         start_res = self.session.post(start_url, data=start_data)
         
@@ -855,8 +1022,9 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             self.send_message(f"❌ Failed to start Facebook Reels upload: {start_res.text}", level=logging.ERROR, immediate=True)
             return False
         
-        video_id = start_res.json().get("video_id")
-        upload_url = start_res.json().get("upload_url")
+        start_body = self.response_json(start_res)
+        video_id = start_body.get("video_id")
+        upload_url = start_body.get("upload_url")
         
         if not video_id or not upload_url:
             self.send_message(f"❌ No video_id or upload_url returned: {start_res.text}", level=logging.ERROR, immediate=True)
@@ -867,11 +1035,13 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             "Authorization": f"OAuth {page_token}",
             "file_url": media_url
         }
-        upload_res = self.session.post(upload_url, headers=headers)
+        # Only the status matters on success, so don't read the body unless it failed
+        upload_res = self.session.post(upload_url, headers=headers, stream=True, timeout=self.HTTP_UPLOAD_TIMEOUT)
         
         if upload_res.status_code != 200:
             self.send_message(f"❌ Facebook Reels upload failed: {upload_res.text}", level=logging.ERROR, immediate=True)
             return False
+        upload_res.close()
         
         # Step 3: Finish and publish with retry logic
         finish_data = {
@@ -883,11 +1053,11 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             "share_to_feed": "true"
         }
         
-        start_time = time.time()
+        deadline = time.monotonic() + self.PUBLISH_MAX_WAIT_TIME
         
         for attempt in range(self.FACEBOOK_PUBLISH_ATTEMPTS):
             # Check timeout
-            if time.time() - start_time > self.PUBLISH_MAX_WAIT_TIME:
+            if time.monotonic() > deadline:
                 self.send_message(f"❌ Facebook Reel publish timeout after {self.PUBLISH_MAX_WAIT_TIME}s", level=logging.ERROR, immediate=True)
                 return False
             
@@ -896,13 +1066,13 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             finish_res = self.session.post(start_url, data=finish_data)
             
             if finish_res.status_code == 200:
-                response_data = finish_res.json()
+                response_data = self.response_json(finish_res)
                 fb_video_id = response_data.get("id", video_id)
                 self.send_message(f"✅ Facebook Reel published!\n📘 Video ID: {fb_video_id}", immediate=True)
-                self.verify_facebook_post_by_video_id(fb_video_id, page_token)
+                self.run_in_background(self.verify_post, "Facebook", fb_video_id, page_token)
                 return True
             else:
-                error_msg = finish_res.text[:200] if finish_res.text else "Unknown error"
+                error_msg = finish_res.text[:200] or "Unknown error"
                 error_type = self.classify_error(finish_res.status_code)
                 
                 self.log_console_only(
@@ -917,8 +1087,9 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                 
                 # Wait before retry
                 if attempt < self.FACEBOOK_PUBLISH_ATTEMPTS - 1:
-                    self.log_console_only(f"⏳ Retrying in {self.PUBLISH_RETRY_INTERVAL}s...", level=logging.INFO)
-                    time.sleep(self.PUBLISH_RETRY_INTERVAL)
+                    delay = self.publish_retry_delay(finish_res, attempt)
+                    self.log_console_only(f"⏳ Retrying in {delay:.1f}s...", level=logging.INFO)
+                    time.sleep(delay)
         
         self.send_message(f"❌ Facebook Reel publish failed after {self.FACEBOOK_PUBLISH_ATTEMPTS} attempts", level=logging.ERROR, immediate=True)
         return False
@@ -927,7 +1098,7 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         """Post video as regular Facebook video with retry logic."""
         self.log_console_only("📘 Starting Facebook Page video upload...", level=logging.INFO)
         
-        post_url = f"https://graph.facebook.com/{self.fb_page_id}/videos"
+        post_url = self.fb_videos_url
         data = {
             "access_token": page_token,
             "file_url": media_url,
@@ -937,11 +1108,11 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         self.log_console_only(f"📄 Page ID: {self.fb_page_id}", level=logging.INFO)
         self.log_console_only(f"📹 Video URL: {media_url[:50]}...", level=logging.INFO)
         
-        start_time = time.time()
+        deadline = time.monotonic() + self.PUBLISH_MAX_WAIT_TIME
         
         for attempt in range(self.FACEBOOK_PUBLISH_ATTEMPTS):
             # Check timeout
-            if time.time() - start_time > self.PUBLISH_MAX_WAIT_TIME:
+            if time.monotonic() > deadline:
                 self.send_message(f"❌ Facebook video publish timeout after {self.PUBLISH_MAX_WAIT_TIME}s", level=logging.ERROR, immediate=True)
                 return False
             
@@ -950,15 +1121,15 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             res = self.session.post(post_url, data=data)
             
             self.log_console_only(f"📊 Response status: {res.status_code}", level=logging.INFO)
+            response_data = self.response_json(res)
             
             if res.status_code == 200:
-                response_data = res.json()
                 video_id = response_data.get("id", "Unknown")
                 self.send_message(f"✅ Facebook video published!\n📘 Video ID: {video_id}", immediate=True)
-                self.verify_facebook_post_by_video_id(video_id, page_token)
+                self.run_in_background(self.verify_post, "Facebook", video_id, page_token)
                 return True
             else:
-                error_msg = res.json().get("error", {}).get("message", "Unknown error")
+                error_msg = response_data.get("error", {}).get("message", "Unknown error")
                 error_type = self.classify_error(res.status_code)
                 
                 self.log_console_only(
@@ -973,8 +1144,9 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                 
                 # Wait before retry
                 if attempt < self.FACEBOOK_PUBLISH_ATTEMPTS - 1:
-                    self.log_console_only(f"⏳ Retrying in {self.PUBLISH_RETRY_INTERVAL}s...", level=logging.INFO)
-                    time.sleep(self.PUBLISH_RETRY_INTERVAL)
+                    delay = self.publish_retry_delay(res, attempt)
+                    self.log_console_only(f"⏳ Retrying in {delay:.1f}s...", level=logging.INFO)
+                    time.sleep(delay)
         
         self.send_message(f"❌ Facebook video publish failed after {self.FACEBOOK_PUBLISH_ATTEMPTS} attempts", level=logging.ERROR, immediate=True)
         return False
@@ -983,7 +1155,7 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         """Post image as Facebook photo."""
         self.log_console_only("🖼️ Starting Facebook photo upload...", level=logging.INFO)
         
-        post_url = f"https://graph.facebook.com/{self.fb_page_id}/photos"
+        post_url = self.fb_photos_url
         data = {
             "access_token": page_token,
             "url": media_url,
@@ -991,31 +1163,27 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         }
         
         res = self.session.post(post_url, data=data)
+        body = self.response_json(res)
         
         if res.status_code == 200:
-            photo_id = res.json().get("id", "Unknown")
+            photo_id = body.get("id", "Unknown")
             self.send_message(f"✅ Facebook photo published!\n🖼️ Photo ID: {photo_id}", immediate=True)
             return True
         else:
-            error_msg = res.json().get("error", {}).get("message", "Unknown error")
+            error_msg = body.get("error", {}).get("message", "Unknown error")
             self.send_message(f"❌ Facebook photo upload failed: {error_msg}", level=logging.ERROR, immediate=True)
             return False
 
-    def post_to_threads(self, dbx, file, caption, total_files=None):
+    def post_to_threads(self, file, temp_link, caption, total_files):
         """Post to Threads using the threads access token."""
-        name = file.name.lower()
-        media_type = "VIDEO" if name.endswith((".mp4", ".mov")) else "IMAGE"
-
-        temp_link = dbx.files_get_temporary_link(file.path_lower).link
-        if total_files is None:
-            total_files = len(self.list_dropbox_files(dbx))
+        media_type = "VIDEO" if _ext(file.name) in self.VIDEO_EXTS else "IMAGE"
 
         self.send_message(f"🚀 Uploading to Threads: {file.name}\n📐 Type: {media_type}\n📦 Remaining: {total_files}", immediate=True)
 
         # Extract topic tag from caption
         topic_tag = self.extract_first_hashtag(caption)
 
-        post_url = f"{self.THREADS_API_BASE}/{self.threads_user_id}/threads"
+        post_url = self.threads_post_url
         data = {
             "access_token": self.threads_access_token,
             "text": caption,
@@ -1039,58 +1207,60 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                 self.send_message(f"❌ Threads media container creation failed: {res.text}", level=logging.ERROR, immediate=True)
                 return False
             
-            creation_id = res.json().get("id")
+            creation_id = self.response_json(res).get("id")
             if not creation_id:
                 self.send_message(f"❌ No creation_id returned", level=logging.ERROR, immediate=True)
                 return False
             
             # Step 2: Poll status until fully processed
-            max_retries = 60
-            for attempt in range(max_retries):
+            for attempt in range(self.THREADS_STATUS_RETRIES):
                 poll_res = self.session.get(
                     f"{self.THREADS_API_BASE}/{creation_id}",
-                    params={"access_token": self.threads_access_token}
+                    params={"fields": "status,error_message", "access_token": self.threads_access_token}
                 )
                 if poll_res.status_code != 200:
-                    self.send_message(f"❌ Polling failed: {poll_res.text}", level=logging.ERROR, immediate=True)
-                    return False
-                
-                status = poll_res.json().get("status")
-                if status == "FINISHED":
-                    self.send_message("✅ Threads video processing FINISHED, waiting 3 seconds...", immediate=True)
-                    time.sleep(3)
-                    break
-                elif status == "ERROR":
-                    self.send_message(f"❌ Threads transcoding failed: {poll_res.text}", level=logging.ERROR, immediate=True)
-                    return False
+                    # Only a permanent error ends the poll; transient failures just cost one interval
+                    if self.classify_error(poll_res.status_code) == "permanent":
+                        self.send_message(f"❌ Polling failed: {poll_res.text}", level=logging.ERROR, immediate=True)
+                        return False
+                    self.log_console_only(f"⚠️ Threads status poll returned HTTP {poll_res.status_code}, retrying...", level=logging.WARNING)
+                else:
+                    status = self.response_json(poll_res).get("status")
+                    if status == "FINISHED":
+                        self.send_message("✅ Threads video processing FINISHED", immediate=True)
+                        break
+                    elif status in ("ERROR", "EXPIRED"):
+                        self.send_message(f"❌ Threads transcoding failed ({status}): {poll_res.text}", level=logging.ERROR, immediate=True)
+                        return False
                 
-                time.sleep(4)
+                time.sleep(self.backoff_delay(attempt, self.THREADS_STATUS_BASE_WAIT, self.THREADS_STATUS_MAX_WAIT))
             
             # Step 3: Publish with retry logic
-            publish_url = f"{self.THREADS_API_BASE}/{self.threads_user_id}/threads_publish"
+            publish_url = self.threads_publish_url
             publish_data = {
                 "access_token": self.threads_access_token,
                 "creation_id": creation_id
             }
             
-            start_time = time.time()
+            deadline = time.monotonic() + self.PUBLISH_MAX_WAIT_TIME
             
             for attempt in range(self.THREADS_PUBLISH_ATTEMPTS):
                 # Check timeout
-                if time.time() - start_time > self.PUBLISH_MAX_WAIT_TIME:
+                if time.monotonic() > deadline:
                     self.send_message(f"❌ Threads publish timeout after {self.PUBLISH_MAX_WAIT_TIME}s", level=logging.ERROR, immediate=True)
                     return False
                 
                 self.log_console_only(f"🔄 Publish attempt {attempt + 1}/{self.THREADS_PUBLISH_ATTEMPTS}", level=logging.INFO)
                 
                 pub_res = self.session.post(publish_url, data=publish_data)
+                pub_body = self.response_json(pub_res)
                 
                 if pub_res.status_code == 200:
-                    thread_id = pub_res.json().get('id', 'Unknown')
+                    thread_id = pub_body.get('id', 'Unknown')
                     self.send_message(f"✅ Threads post published! ID: {thread_id}", immediate=True)
                     return thread_id  # Return ID for verification
                 else:
-                    error_msg = pub_res.json().get("error", {}).get("message", "Unknown error")
+                    error_msg = pub_body.get("error", {}).get("message", "Unknown error")
                     error_type = self.classify_error(pub_res.status_code)
                     
                     self.log_console_only(
@@ -1105,8 +1275,9 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                     
                     # Wait before retry
                     if attempt < self.THREADS_PUBLISH_ATTEMPTS - 1:
-                        self.log_console_only(f"⏳ Retrying in {self.PUBLISH_RETRY_INTERVAL}s...", level=logging.INFO)
-                        time.sleep(self.PUBLISH_RETRY_INTERVAL)
+                        delay = self.publish_retry_delay(pub_res, attempt)
+                        self.log_console_only(f"⏳ Retrying in {delay:.1f}s...", level=logging.INFO)
+                        time.sleep(delay)
             
             self.send_message(f"❌ Threads publish failed after {self.THREADS_PUBLISH_ATTEMPTS} attempts", level=logging.ERROR, immediate=True)
             return False
@@ -1115,18 +1286,74 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             data["media_type"] = "TEXT_POST"
             res = self.session.post(post_url, data=data)
             if res.status_code == 200:
-                thread_id = res.json().get('id', 'Unknown')
+                thread_id = self.response_json(res).get('id', 'Unknown')
                 self.send_message(f"✅ Threads text post published! ID: {thread_id}", immediate=True)
                 return thread_id  # Return ID for verification
             else:
                 self.send_message(f"❌ Threads post failed: {res.text}", level=logging.ERROR, immediate=True)
                 return False
 
+    def post_and_verify_threads(self, file, temp_link, caption, total_files):
+        """Post to Threads and start verifying the post in the background, like the Instagram/Facebook paths do."""
+        thread_id = self.post_to_threads(file, temp_link, caption, total_files)
+        if not thread_id or thread_id == 'Unknown':
+            return False
+        # Verify Threads post is live
+        self.run_in_background(self.verify_post, "Threads", thread_id, self.threads_access_token)
+        return True
+
     def extract_first_hashtag(self, text):
         """Extract the first hashtag (without #) from text for use as topic tag."""
-        match = re.search(r"#(\w+)", text)
+        match = _HASHTAG_RE.search(text)
         return match.group(1) if match else None
 
+    def response_json(self, res):
+        """Parse a response body once; returns {} for empty, non-JSON or non-object bodies."""
+        if not res.content:
+            return {}
+        try:
+            # json.loads takes the raw bytes directly, skipping requests' text decoding
+            data = json.loads(res.content)
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def retry_after(self, res):
+        """Seconds the server asked us to wait via a numeric Retry-After header or Meta's usage header, or None."""
+        value = res.headers.get("Retry-After", "").strip()
+        try:
+            if value:
+                return max(0.0, float(value))
+        except ValueError:
+            pass  # HTTP-date form; fall back to our own backoff
+        return self.graph_regain_seconds(res)
+
+    def graph_regain_seconds(self, res):
+        """Seconds until Meta lifts a business-use-case throttle, from X-Business-Use-Case-Usage, or None."""
+        header = res.headers.get("X-Business-Use-Case-Usage")
+        if not header:
+            return None
+        try:
+            usage = json.loads(header)
+            minutes = max(
+                (entry.get("estimated_time_to_regain_access", 0) for entries in usage.values() for entry in entries),
+                default=0
+            )
+        except (ValueError, AttributeError, TypeError):
+            return None
+        return minutes * 60.0 if minutes else None
+
+    def backoff_delay(self, attempt, base, max_delay):
+        """Exponential backoff with jitter: base * 2**attempt, capped at max_delay, scaled by 0.5-1.5."""
+        return min(max_delay, base * 2 ** attempt) * (0.5 + random.random())
+
+    def publish_retry_delay(self, res, attempt):
+        """Delay before retrying a failed publish: the server's Retry-After if given, else jittered backoff."""
+        retry_after = self.retry_after(res)
+        if retry_after is not None:
+            return min(retry_after, self.PUBLISH_RETRY_MAX_INTERVAL)
+        return self.backoff_delay(attempt, self.PUBLISH_RETRY_INTERVAL, self.PUBLISH_RETRY_MAX_INTERVAL)
+
     def classify_error(self, status_code):
         """
         Classify error types to determine retry behavior.
@@ -1137,14 +1364,7 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         Returns:
             str: Error type ('permanent', 'rate_limit', 'transient', 'unknown')
         """
-        if status_code in (400, 403, 404):
-            return "permanent"  # Don't retry
-        elif status_code == 429:
-            return "rate_limit"  # Retry after longer delay
-        elif 500 <= status_code < 600:
-            return "transient"  # Retry normally
-        else:
-            return "unknown"  # Retry normally
+        return self.ERROR_CLASSES.get(status_code, "unknown")  # Unknown codes retry normally
 
     def unified_verify_post(self, platform_name, check_fn, initial_delay=0):
         """
@@ -1152,24 +1372,25 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         
         Args:
             platform_name: Name of the platform (Instagram, Facebook, Threads)
-            check_fn: Function that returns (success: bool, status_code: int, message: str)
+            check_fn: Function that returns (success: bool, status_code: int, message: str,
+                      retry_after: float or None)
             initial_delay: Delay before starting verification
         """
         try:
-            self.log_console_only(f"🔍 Verifying {platform_name} post is live...", level=logging.INFO)
+            self.log_console_only("🔍 Verifying %s post is live...", platform_name, level=logging.INFO)
             
             # Initial delay for post indexing
             if initial_delay > 0:
-                self.log_console_only(f"⏳ Waiting {initial_delay} seconds for post to be indexed...", level=logging.INFO)
+                self.log_console_only("⏳ Waiting %s seconds for post to be indexed...", initial_delay, level=logging.INFO)
                 time.sleep(initial_delay)
             
             for attempt in range(self.VERIFY_ATTEMPTS):
-                self.log_console_only(f"🔄 Verification attempt {attempt + 1}/{self.VERIFY_ATTEMPTS}", level=logging.INFO)
+                self.log_console_only("🔄 Verification attempt %d/%d", attempt + 1, self.VERIFY_ATTEMPTS, level=logging.INFO)
                 
-                success, status_code, message = check_fn()
+                success, status_code, message, retry_after = check_fn()
                 
                 if success:
-                    self.log_console_only(f"✅ {platform_name} post verified as live!\n{message}", level=logging.INFO)
+                    self.log_console_only("✅ %s post verified as live!\n%s", platform_name, message, level=logging.INFO)
                     return True
                 
                 # Classify error to determine retry behavior
@@ -1178,35 +1399,37 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                 # Log error details with truncated message
                 error_preview = (message[:150] + "...") if len(str(message)) > 150 else message
                 self.log_console_only(
-                    f"❌ {platform_name} verification failed: HTTP {status_code} ({error_type})\n"
-                    f"   Error: {error_preview}",
+                    "❌ %s verification failed: HTTP %s (%s)\n"
+                    "   Error: %s",
+                    platform_name, status_code, error_type, error_preview,
                     level=logging.INFO
                 )
                 
                 # Smart retry logic based on error type
                 if error_type == "permanent":
                     self.log_console_only(
-                        f"⚠️ Permanent error (HTTP {status_code}). Stopping verification.",
+                        "⚠️ Permanent error (HTTP %s). Stopping verification.", status_code,
                         level=logging.WARNING
                     )
                     break  # Don't retry permanent errors
                 elif error_type == "rate_limit":
-                    wait_time = 30  # Longer wait for rate limits
+                    # Honor the server's Retry-After, otherwise use a longer wait for rate limits
+                    wait_time = min(retry_after, self.VERIFY_MAX_INTERVAL) if retry_after is not None else 30
                     self.log_console_only(
-                        f"⏳ Rate limit detected. Waiting {wait_time}s before retry...",
+                        "⏳ Rate limit detected. Waiting %ss before retry...", wait_time,
                         level=logging.INFO
                     )
                     if attempt < self.VERIFY_ATTEMPTS - 1:
                         time.sleep(wait_time)
                 elif error_type in ("transient", "unknown"):
-                    # Normal retry with interval
+                    # Full-jitter exponential backoff: quick first retry, no synchronized retries
                     if attempt < self.VERIFY_ATTEMPTS - 1:
-                        if self.USE_EXPONENTIAL_BACKOFF:
-                            backoff_time = self.VERIFY_INTERVAL * (attempt + 1)
+                        if retry_after is not None:
+                            backoff_time = min(retry_after, self.VERIFY_MAX_INTERVAL)
                         else:
-                            backoff_time = self.VERIFY_INTERVAL
+                            backoff_time = random.uniform(0, min(self.VERIFY_MAX_INTERVAL, self.VERIFY_INTERVAL * 2 ** attempt))
                         self.log_console_only(
-                            f"⏳ Retrying in {backoff_time}s...",
+                            "⏳ Retrying in %.1fs...", backoff_time,
                             level=logging.INFO
                         )
                         time.sleep(backoff_time)
@@ -1221,80 +1444,34 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             self.send_message(f"❌ Exception verifying {platform_name} post: {e}", level=logging.ERROR)
             return False
 
-    def verify_instagram_post_by_media_id(self, media_id, page_token):
-        """Verify Instagram post is live by polling the published media_id."""
-        url = f"{self.INSTAGRAM_API_BASE}/{media_id}"
-        params = {
-            "fields": "id,permalink_url,media_type,media_url,thumbnail_url,created_time",
-            "access_token": page_token
-        }
-        
-        def check_post():
-            res = self.session.get(url, params=params)
-            if res.status_code == 200:
-                post_data = res.json()
-                permalink = post_data.get("permalink_url", "Not available")
-                return True, res.status_code, f"🔗 {permalink}"
-            else:
-                # Try to extract error message from response
-                try:
-                    error_data = res.json()
-                    error_msg = error_data.get("error", {}).get("message", res.text[:200])
-                except:
-                    error_msg = res.text[:200] if res.text else "No error message"
-                return False, res.status_code, error_msg
-        
-        return self.unified_verify_post("Instagram", check_post, self.VERIFY_DELAY_INSTAGRAM)
-
-    def verify_facebook_post_by_video_id(self, video_id, page_token):
-        """Verify Facebook video post is live by polling the video_id."""
-        url = f"https://graph.facebook.com/{video_id}"
-        params = {
-            "fields": "id,permalink_url,created_time,length,title,description",
-            "access_token": page_token
-        }
-        
-        def check_post():
-            res = self.session.get(url, params=params)
-            if res.status_code == 200:
-                post_data = res.json()
-                permalink = post_data.get("permalink_url", "Not available")
-                return True, res.status_code, f"🔗 {permalink}"
-            else:
-                # Try to extract error message from response
-                try:
-                    error_data = res.json()
-                    error_msg = error_data.get("error", {}).get("message", res.text[:200])
-                except:
-                    error_msg = res.text[:200] if res.text else "No error message"
-                return False, res.status_code, error_msg
-        
-        return self.unified_verify_post("Facebook", check_post, self.VERIFY_DELAY_FACEBOOK)
-
-    def verify_threads_post(self, thread_id):
-        """Verify Threads post is live by polling the thread_id."""
-        url = f"{self.THREADS_API_BASE}/{thread_id}"
-        params = {
-            "access_token": self.threads_access_token
-        }
+    def verify_post(self, platform_name, post_id, access_token):
+        """Verify a published post is live by polling its node (see VERIFY_TARGETS)."""
+        base, fields, initial_delay = self.VERIFY_TARGETS[platform_name]
+        # Encode the query once instead of on every attempt
+        full_url = f"{base}/{post_id}?{urlencode({'fields': fields, 'access_token': access_token})}"
         
         def check_post():
-            res = self.session.get(url, params=params)
+            res = self.session.get(full_url)
+            body = self.response_json(res)
             if res.status_code == 200:
-                return True, res.status_code, f"📄 Thread ID: {thread_id}"
+                if "permalink" in fields:
+                    link = body.get("permalink_url") or body.get("permalink") or "Not available"
+                    return True, res.status_code, f"🔗 {link}", None
+                return True, res.status_code, f"📄 {platform_name} ID: {post_id}", None
             else:
-                # Try to extract error message from response
-                try:
-                    error_data = res.json()
-                    error_msg = error_data.get("error", {}).get("message", res.text[:200])
-                except:
-                    error_msg = res.text[:200] if res.text else "No error message"
-                return False, res.status_code, error_msg
+                error = body.get("error", {})
+                error_msg = error.get("message") or res.content[:200].decode("utf-8", "replace") or "No error message"
+                # Meta signals throttling with 400/403 plus an error code; treat it like a 429
+                status_code = 429 if error.get("code") in self.GRAPH_THROTTLE_CODES else res.status_code
+                return False, status_code, error_msg, self.retry_after(res)
         
-        return self.unified_verify_post("Threads", check_post, self.VERIFY_DELAY_THREADS)
+        return self.unified_verify_post(platform_name, check_post, initial_delay)
 
     def check_token_expiry(self):
         """Check Meta token expiry and validate before starting."""
+        if not self.meta_token:
+            self.send_message("❌ META_TOKEN is not set; skipping token check.", level=logging.ERROR, immediate=True)
+            return False
         try:
             self.log_console_only("🔍 Checking token expiry...", level=logging.INFO)
             url = "https://graph.facebook.com/debug_token"
@@ -1308,50 +1485,62 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                 self.send_message(f"❌ Failed to check token: {res.text}", level=logging.ERROR, immediate=True)
                 return False
                 
-            data = res.json().get("data", {})
-            is_valid = data.get("is_valid", False)
-            expires_at = data.get("expires_at")
-            
-            if not is_valid:
-                self.send_message("❌ Token is invalid or expired!", level=logging.ERROR, immediate=True)
-                return False
-            
-            if expires_at:
-                expiry_dt = datetime.utcfromtimestamp(expires_at)
-                delta = expiry_dt - datetime.utcnow()
-                self.log_console_only(f"✅ Token valid - Expires: {expiry_dt.strftime('%Y-%m-%d')} ({delta.days} days left)", level=logging.INFO)
-            else:
-                self.log_console_only("✅ Token valid - Does not expire", level=logging.INFO)
-            
-            return True
+            return self.validate_debug_token(self.response_json(res).get("data", {}))
             
         except Exception as e:
             self.send_message(f"❌ Token check failed: {e}", level=logging.ERROR, immediate=True)
             return False
 
-    def check_instagram_page_connection(self, page_token):
-        """Check if Instagram account is properly connected to the Facebook page."""
+    def validate_debug_token(self, data):
+        """Validate a parsed debug_token "data" payload and log its expiry. Makes no requests."""
+        is_valid, expires_at = data.get("is_valid", False), data.get("expires_at")
+        
+        if not is_valid:
+            self.send_message("❌ Token is invalid or expired!", level=logging.ERROR, immediate=True)
+            return False
+        
+        if expires_at:
+            expiry_dt = datetime.fromtimestamp(expires_at, tz=timezone.utc)
+            delta = expiry_dt - datetime.now(timezone.utc)
+            self.log_console_only("✅ Token valid - Expires: %s (%d days left)", expiry_dt.date(), delta.days, level=logging.INFO)
+        else:
+            self.log_console_only("✅ Token valid - Does not expire", level=logging.INFO)
+        
+        return True
+
+    def check_instagram_page_connection(self, page_token, data=None):
+        """
+        Check if Instagram account is properly connected to the Facebook page.
+        
+        Args:
+            page_token: Token used to read the page fields when data is not supplied
+            data: Already-fetched page payload with the instagram account fields
+        """
+        if not self.fb_page_id or not self.ig_id or (data is None and not page_token):
+            self.log_console_only("⏭️ Skipping Instagram connection check: missing credentials", level=logging.WARNING)
+            return False
         try:
-            self.log_console_only("🔍 Checking Instagram-Facebook connection...", level=logging.INFO)
-            
-            url = f"https://graph.facebook.com/v18.0/{self.fb_page_id}"
-            params = {
-                "fields": "instagram_business_account,connected_instagram_account",
-                "access_token": page_token
-            }
-            
-            res = self.session.get(url, params=params)
-            if res.status_code != 200:
-                self.send_message(f"❌ Failed to check Instagram connection: {res.text}", level=logging.ERROR, immediate=True)
-                return False
-            
-            data = res.json()
+            if data is None:
+                self.log_console_only("🔍 Checking Instagram-Facebook connection...", level=logging.INFO)
+                
+                url = f"https://graph.facebook.com/v18.0/{self.fb_page_id}"
+                params = {
+                    "fields": "instagram_business_account,connected_instagram_account",
+                    "access_token": page_token
+                }
+                
+                res = self.session.get(url, params=params)
+                if res.status_code != 200:
+                    self.send_message(f"❌ Failed to check Instagram connection: {res.text}", level=logging.ERROR, immediate=True)
+                    return False
+                
+                data = self.response_json(res)
             instagram_business_account = data.get("instagram_business_account", {})
             connected_instagram = data.get("connected_instagram_account", {})
             
             if instagram_business_account:
                 instagram_id = instagram_business_account.get("id", "Unknown")
-                self.log_console_only(f"✅ Instagram Business Account connected: {instagram_id}", level=logging.INFO)
+                self.log_console_only("✅ Instagram Business Account connected: %s", instagram_id, level=logging.INFO)
                 
                 if instagram_id == self.ig_id:
                     self.log_console_only("✅ Instagram ID matches", level=logging.INFO)
@@ -1370,11 +1559,144 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             self.send_message(f"❌ Exception checking connection: {e}", level=logging.ERROR, immediate=True)
             return False
 
+    def graph_batch(self, access_token, batch):
+        """
+        Send several Graph API requests in a single round-trip.
+        
+        Args:
+            access_token: Token applied to every request in the batch
+            batch: List of {"method", "relative_url"} dicts
+            
+        Returns:
+            list: (status_code, body_dict) per request, or None if the batch call failed
+        """
+        try:
+            res = self.session.post(f"{self.INSTAGRAM_API_BASE}/", data={
+                "access_token": access_token,
+                "batch": json.dumps(batch),
+                "include_headers": "false"
+            })
+            entries = json.loads(res.content) if res.status_code == 200 else None
+        except (requests.RequestException, ValueError) as e:
+            self.log_console_only(f"⚠️ Graph batch request failed: {e}", level=logging.WARNING)
+            return None
+        if not isinstance(entries, list):
+            self.log_console_only(f"⚠️ Graph batch request failed: HTTP {res.status_code}", level=logging.WARNING)
+            return None
+        
+        results = []
+        for entry in entries:
+            if not entry:
+                results.append((None, {}))
+                continue
+            try:
+                body = json.loads(entry.get("body") or "{}")
+            except ValueError:
+                body = {}
+            results.append((entry.get("code"), body if isinstance(body, dict) else {}))
+        return results
+
+    def disk_cache_key(self):
+        """Cache key for the current token/page pair; only a hash of the user token is stored."""
+        token_hash = hashlib.sha256((self.meta_token or "").encode()).hexdigest()[:16]
+        return f"{token_hash}:{self.fb_page_id}"
+
+    def load_disk_cache(self):
+        """Read the on-disk cache, ignoring it if missing, corrupt or written for other credentials."""
+        try:
+            with open(self.DISK_CACHE_PATH) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict) or cache.get("key") != self.disk_cache_key():
+            return {}
+        # Entries from older versions (such as a persisted page token) are dropped on the next save
+        return {name: cache[name] for name in self.DISK_CACHE_ENTRIES if name in cache}
+
+    def save_disk_cache(self, **entries):
+        """Merge entries into the on-disk cache, written owner-only."""
+        cache = self.load_disk_cache()
+        cache.update(entries, key=self.disk_cache_key())
+        try:
+            if os.path.exists(self.DISK_CACHE_PATH):
+                os.remove(self.DISK_CACHE_PATH)  # Recreate so the owner-only mode always applies
+            with os.fdopen(os.open(self.DISK_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            self.log_console_only(f"⚠️ Could not write cache: {e}", level=logging.WARNING)
+
+    def clear_disk_cache(self):
+        """Drop the on-disk cache so the next run re-checks everything with Graph."""
+        try:
+            os.remove(self.DISK_CACHE_PATH)
+        except OSError:
+            pass
+
+    def cached_preflight(self):
+        """Return the cached preflight entry if it is recent and the token is far from expiry."""
+        preflight = self.load_disk_cache().get("preflight")
+        if not isinstance(preflight, dict):
+            return None
+        now = time.time()  # Wall clock: the entry was written by an earlier process
+        token_data = preflight.get("debug_token") or {}
+        expires_at = token_data.get("expires_at") or 0
+        if not token_data.get("is_valid") or now - preflight.get("written_at", 0) >= self.PREFLIGHT_CACHE_TTL:
+            return None
+        if expires_at and expires_at - now <= self.PREFLIGHT_MIN_TOKEN_LIFE:
+            return None
+        return preflight
+
+    def run_preflight_checks(self):
+        """
+        Validate the Meta token and the Instagram-Facebook link with one batched Graph call.
+        
+        A recent successful result is reused from the on-disk cache. Falls back to the
+        standalone check_token_expiry() when the batch fails. If only the connection
+        lookup fails, process_file re-checks it with the page token.
+        """
+        preflight = self.cached_preflight()
+        if preflight:
+            self._ig_connection_ok = preflight.get("ig_connection")
+            self.log_console_only("✅ Token valid (cached check)", level=logging.INFO)
+            return True
+        
+        valid = self.fetch_preflight_checks()
+        if not valid:
+            self.clear_disk_cache()
+        return valid
+
+    def fetch_preflight_checks(self):
+        """Run the batched token/connection checks against Graph and cache a successful result."""
+        self.log_console_only("🔍 Checking token expiry and Instagram connection...", level=logging.INFO)
+        results = None
+        if self.meta_token and self.fb_page_id:
+            results = self.graph_batch(self.meta_token, [
+                {"method": "GET", "relative_url": f"debug_token?input_token={quote(self.meta_token)}"},
+                {"method": "GET", "relative_url": f"{self.fb_page_id}?fields=instagram_business_account,connected_instagram_account"}
+            ])
+        if not results or len(results) != 2 or results[0][0] != 200:
+            return self.check_token_expiry()
+        
+        (_, token_body), (connection_code, connection_body) = results
+        if not self.validate_debug_token(token_body.get("data", {})):
+            return False
+        if connection_code == 200:
+            self._ig_connection_ok = self.check_instagram_page_connection(None, data=connection_body)
+        # Only a confirmed connection is cached; failures are re-checked on the next run
+        self.save_disk_cache(preflight={
+            "written_at": time.time(),
+            "debug_token": token_body.get("data", {}),
+            "ig_connection": True if self._ig_connection_ok else None
+        })
+        return True
+
     def authenticate_dropbox(self):
         """Authenticate with Dropbox and return the client."""
         try:
+            import dropbox  # Deferred: loaded on the auth thread, overlapping the Meta preflight
             access_token = self.refresh_dropbox_token()
-            return dropbox.Dropbox(oauth2_access_token=access_token)
+            # Share the pooled session so Dropbox calls reuse the same adapter
+            return dropbox.Dropbox(oauth2_access_token=access_token, session=self.session)
         except Exception as e:
             self.send_message(f"❌ Dropbox authentication failed: {e}", level=logging.ERROR, immediate=True)
             raise
@@ -1396,83 +1718,95 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         self.send_message(f"🤖 Generating AI captions for: {file.name}", level=logging.INFO, immediate=True)
         captions = self.build_ai_caption_from_filename(file)
         
-        caption_instagram = captions.get('instagram', self.build_caption_from_filename(file))
-        caption_facebook = captions.get('facebook', self.build_caption_from_filename(file))
-        caption_threads = captions.get('threads', self.build_caption_from_filename(file))
-        
-        results = {
-            'instagram': False,
-            'facebook': False,
-            'threads': False
-        }
+        caption_instagram = captions['instagram']
+        caption_facebook = captions['facebook']
+        caption_threads = captions['threads']
         
+        results = dict.fromkeys((key for key, _ in self.PLATFORMS), False)
+
         try:
-            # Get page token for Instagram/Facebook (both use same Meta token)
-            page_token = self.get_page_access_token()
-            if not page_token:
-                self.send_message("❌ Could not retrieve Page access token. Aborting Instagram/Facebook.", level=logging.ERROR, immediate=True)
-                results['instagram'] = False
-                results['facebook'] = False
-            else:
-                # Check Instagram connection before posting
-                if not self.check_instagram_page_connection(page_token):
-                    self.send_message("❌ Instagram not properly connected. Aborting Instagram.", level=logging.ERROR, immediate=True)
-                    results['instagram'] = False
-                else:
-                    # Post to Instagram with platform-specific caption
-                    results['instagram'] = self.post_to_instagram(dbx, file, caption_instagram, page_token, total_files)
-                
-                # Post to Facebook with platform-specific caption
-                results['facebook'] = self.post_to_facebook_page(dbx, file, caption_facebook, page_token)
-            
-            # Post to Threads with platform-specific caption
-            thread_id = self.post_to_threads(dbx, file, caption_threads, total_files)
-            if thread_id and thread_id != 'Unknown':
-                results['threads'] = True
-                # Verify Threads post is live
-                self.verify_threads_post(thread_id)
-            else:
-                results['threads'] = False
+            # The three platforms are independent, so post to them concurrently
+            # One temporary link serves all three platforms
+            temp_link = dbx.files_get_temporary_link(file.path_lower).link
             
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                # Threads needs no page token, so start it before the Meta lookups
+                futures = {
+                    executor.submit(self.post_and_verify_threads, file, temp_link, caption_threads, total_files): 'threads'
+                }
+
+                # Get page token for Instagram/Facebook (both use same Meta token)
+                page_token = self.get_page_access_token()
+                if not page_token:
+                    self.send_message("❌ Could not retrieve Page access token. Aborting Instagram/Facebook.", level=logging.ERROR, immediate=True)
+                else:
+                    # Check Instagram connection before posting (reuses the preflight result when available)
+                    ig_connected = self._ig_connection_ok
+                    if ig_connected is None:
+                        ig_connected = self.check_instagram_page_connection(page_token)
+                        # The IG-FB link is near-permanent; only a confirmed one is remembered
+                        if ig_connected:
+                            self._ig_connection_ok = True
+                    if not ig_connected:
+                        self.send_message("❌ Instagram not properly connected. Aborting Instagram.", level=logging.ERROR, immediate=True)
+                    else:
+                        # Post to Instagram with platform-specific caption
+                        futures[executor.submit(self.post_to_instagram, file, temp_link, caption_instagram, page_token, total_files)] = 'instagram'
+
+                    # Post to Facebook with platform-specific caption
+                    futures[executor.submit(self.post_to_facebook_page, dbx, file, temp_link, caption_facebook, page_token)] = 'facebook'
+
+                for future in as_completed(futures):
+                    platform = futures[future]
+                    try:
+                        results[platform] = future.result()
+                    except Exception as e:
+                        self.send_message(f"❌ Exception during {platform} post: {e}", level=logging.ERROR, immediate=True)
+                        results[platform] = False
+
         except Exception as e:
             self.send_message(f"❌ Exception during post: {e}", level=logging.ERROR, immediate=True)
         
-        # Delete file after posting
+        # Delete file after posting, in the background so the report isn't held up. It waits for the
+        # background verifications, since a platform may still be fetching the shared temporary link.
+        # If every platform failed, keep it so a later run can retry (reusing its cached captions)
+        if any(results.values()):
+            self.run_in_background(self.delete_dropbox_file, dbx, file, list(self._background_threads))
+        else:
+            self.log_console_only(f"📁 Keeping {file.name} in Dropbox since no platform succeeded", level=logging.WARNING)
+        
+        # Report results with detailed summary (send_message also logs it to the console)
+        summary_lines = ["📊 Posting Summary:"]
+        summary_lines.extend(f"   {f'{label}:':<10} {'✅ Success' if results[key] else '❌ Failed'}" for key, label in self.PLATFORMS)
+        self.send_message("\n".join(summary_lines), immediate=True)
+        
+        return any(results.values())  # Return True if any platform succeeded
+
+    def delete_dropbox_file(self, dbx, file, wait_for=()):
+        """Delete a posted file from Dropbox, once the threads in wait_for have finished."""
+        for thread in wait_for:
+            thread.join()
         try:
             dbx.files_delete_v2(file.path_lower)
+            self._files_cache = None
             self.log_console_only(f"🗑️ Deleted: {file.name}")
         except Exception as e:
             self.log_console_only(f"⚠️ Failed to delete: {e}", level=logging.WARNING)
-        
-        # Report results with detailed summary
-        summary_lines = [
-            f"📊 Posting Summary:",
-            f"   Instagram: {'✅ Success' if results['instagram'] else '❌ Failed'}",
-            f"   Facebook:  {'✅ Success' if results['facebook'] else '❌ Failed'}",
-            f"   Threads:   {'✅ Success' if results['threads'] else '❌ Failed'}"
-        ]
-        self.send_message("\n".join(summary_lines), immediate=True)
-        
-        # Also send simplified status
-        status_report = []
-        if results['instagram']:
-            status_report.append("Instagram ✅")
-        else:
-            status_report.append("Instagram ❌")
-            
-        if results['facebook']:
-            status_report.append("Facebook ✅")
-        else:
-            status_report.append("Facebook ❌")
-            
-        if results['threads']:
-            status_report.append("Threads ✅")
-        else:
-            status_report.append("Threads ❌")
-        
-        self.log_console_only(f"📊 Final Status: {' | '.join(status_report)}")
-        
-        return any(results.values())  # Return True if any platform succeeded
+
+    def run_in_background(self, fn, *args):
+        """Run fn on a daemon thread; run() waits for it (bounded) before exiting."""
+        thread = threading.Thread(target=fn, args=args, daemon=True)
+        thread.start()
+        self._background_threads.append(thread)
+
+    def wait_for_background_tasks(self):
+        """Wait up to BACKGROUND_TASK_TIMEOUT seconds in total for background work to finish."""
+        deadline = time.monotonic() + self.BACKGROUND_TASK_TIMEOUT
+        for thread in self._background_threads:
+            thread.join(max(0, deadline - time.monotonic()))
+            if thread.is_alive():
+                self.log_console_only("⚠️ Background task still running at exit", level=logging.WARNING)
+        self._background_threads = []
 
     def test_groq_api(self):
         """Test method to verify Groq API is working."""
@@ -1484,18 +1818,11 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             return False
         
         try:
-            groq_client = Groq(api_key=groq_api_key)
-            self.log_console_only("✅ Groq client initialized", level=logging.INFO)
+            groq_client = self.get_groq_client(groq_api_key)
             
             # Test with a simple prompt
             test_prompt = "Generate a short 10-word caption about nature."
-            models_to_try = [
-                "llama-3.1-8b-instant",
-                "llama3-8b-8192",
-                "llama-3.1-70b-versatile",
-            ]
-            
-            for model_name in models_to_try:
+            for model_name in self.groq_models():
                 try:
                     self.log_console_only(f"🔄 Testing model: {model_name}", level=logging.INFO)
                     response = groq_client.chat.completions.create(
@@ -1507,6 +1834,8 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
                     if response and response.choices:
                         result = response.choices[0].message.content.strip()
                         self.send_message(f"✅ API Test Successful!\nModel: {model_name}\nResponse: {result}", level=logging.INFO, immediate=True)
+                        self._groq_model = model_name
+                        self.remember_groq_model()
                         return True
                 except Exception as e:
                     self.log_console_only(f"⚠️ Model {model_name} failed: {str(e)}", level=logging.WARNING)
@@ -1524,14 +1853,19 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
         self.log_console_only(f"📡 Run started: {datetime.now(self.ist).strftime('%Y-%m-%d %H:%M:%S')}", level=logging.INFO)
         
         try:
-            # Validate token before starting
-            token_valid = self.check_token_expiry()
+            # Refresh the Dropbox token in the background while the Meta checks run
+            auth_executor = ThreadPoolExecutor(max_workers=1)
+            dbx_future = auth_executor.submit(self.authenticate_dropbox)
+            auth_executor.shutdown(wait=False)
+            
+            # Validate token (and the Instagram connection) before starting
+            token_valid = self.run_preflight_checks()
             if not token_valid:
                 self.send_message("❌ Token validation failed. Stopping execution.", level=logging.ERROR, immediate=True)
                 return
             
-            # Authenticate with Dropbox
-            dbx = self.authenticate_dropbox()
+            # Authenticated Dropbox client (re-raises if authentication failed)
+            dbx = dbx_future.result()
             
             # Process one file (caption comes from filename)
             success = self.process_file(dbx)
@@ -1545,9 +1879,10 @@ Generate only the caption text, nothing else. Keep it short and powerful. Rememb
             self.send_message(f"❌ Script crashed: {e}", level=logging.ERROR, immediate=True)
             raise
         finally:
-            # Send summary
+            # Let the background Dropbox delete finish, then send summary
+            self.wait_for_background_tasks()
             self.send_log_summary()
-            duration = time.time() - self.start_time
+            duration = time.monotonic() - self.start_time
             self.log_console_only(f"🏁 Run complete in {duration:.1f} seconds", level=logging.INFO)
 
 if __name__ == "__main__":
@@ -1557,6 +1892,9 @@ if __name__ == "__main__":
     
     # Allow testing API with: python script.py test
     if len(sys.argv) > 1 and sys.argv[1].lower() == "test":
-        uploader.test_groq_api()
+        try:
+            uploader.test_groq_api()
+        finally:
+            uploader.send_log_summary()  # The sender thread is a daemon, so flush before exiting
     else:
         uploader.run()